@@ -0,0 +1,179 @@
+import argparse
+import http.client
+import json
+import os
+import pathlib
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+
+SERVER_DIR = pathlib.Path(__file__).resolve().parent / 'server'
+GET_PATHS = ['/', '/message', '/style.css', '/logo.png']
+
+
+def free_port(kind=socket.SOCK_STREAM):
+    with socket.socket(socket.AF_INET, kind) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start(args, cwd):
+    return subprocess.Popen(
+        [sys.executable, *args],
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def stop(process):
+    if process.poll() is None:
+        os.killpg(process.pid, signal.SIGINT)
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+
+
+def wait_for_http(port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), 0.5).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f'HTTP server did not start on port {port}')
+
+
+def send_request(port, index, post_ratio, run_id):
+    if random.random() < post_ratio:
+        method, path = 'POST', '/message'
+        body = urllib.parse.urlencode({'username': f'bench-{run_id}', 'message': str(index)})
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+    else:
+        method, path, body, headers = 'GET', random.choice(GET_PATHS), None, {}
+
+    started = time.perf_counter()
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        conn.close()
+        status = response.status
+    except OSError:
+        status = None
+
+    return method, index, status, time.perf_counter() - started
+
+
+def count_stored(storage_dir, run_id):
+    username = f'bench-{run_id}'
+    stored = set()
+    for path in pathlib.Path(storage_dir).glob('data*.jsonl'):
+        with open(path, 'r', encoding='utf-8') as fh:
+            for line in fh:
+                if not line.endswith('\n'):
+                    break
+                data = json.loads(line)['data']
+                if data.get('username') == username:
+                    stored.add(int(data['message']))
+    return stored
+
+
+def wait_for_storage(storage_dir, run_id, expected, timeout):
+    deadline = time.monotonic() + timeout
+    stored = count_stored(storage_dir, run_id)
+    while len(stored) < expected and time.monotonic() < deadline:
+        time.sleep(0.2)
+        stored = count_stored(storage_dir, run_id)
+    return stored
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def report(results, elapsed, accepted, stored):
+    print(f'Requests:   {len(results)} in {elapsed:.2f}s ({len(results) / elapsed:.1f} req/s)')
+
+    for method in ('GET', 'POST'):
+        latencies = [latency * 1000 for m, _, status, latency in results if m == method and status is not None]
+        ok = sum(1 for m, _, status, _ in results if m == method and status is not None and status < 400)
+        failed = sum(1 for m, _, _, _ in results if m == method) - ok
+        if not ok and not failed:
+            continue
+        print(
+            f'{method:<5} ok={ok} failed={failed} '
+            f'p50={percentile(latencies, 50):.2f}ms p90={percentile(latencies, 90):.2f}ms '
+            f'p99={percentile(latencies, 99):.2f}ms max={max(latencies, default=0):.2f}ms'
+        )
+
+    lost = len(accepted - stored)
+    loss = lost / len(accepted) * 100 if accepted else 0.0
+    print(f'Messages:   accepted={len(accepted)} stored={len(accepted & stored)} lost={lost} ({loss:.2f}%)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test for the HTTP + UDP message pipeline')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--post-ratio', type=float, default=0.5)
+    parser.add_argument('--workers', type=int, default=1, help='UDP ingest worker processes')
+    parser.add_argument('--threaded', action='store_true', help='use ThreadingHTTPServer')
+    parser.add_argument('--batch', action='store_true', help='batch UDP datagrams in the HTTP server')
+    parser.add_argument('--drain-timeout', type=float, default=10.0)
+    args = parser.parse_args()
+
+    run_id = f'{os.getpid()}-{int(time.time())}'
+    http_port = free_port()
+    udp_port = free_port(socket.SOCK_DGRAM)
+
+    with tempfile.TemporaryDirectory() as storage_dir:
+        udp_server = start(
+            ['socket_server.py', 'serve', '--port', str(udp_port), '--workers', str(args.workers), '--storage-dir', storage_dir],
+            SERVER_DIR / 'sockets',
+        )
+        http_args = ['main.py', '--port', str(http_port), '--udp-port', str(udp_port), '--storage-dir', storage_dir]
+        if args.threaded:
+            http_args.append('--threaded')
+        if args.batch:
+            http_args.append('--batch')
+        http_server = start(http_args, SERVER_DIR)
+
+        try:
+            wait_for_http(http_port)
+            time.sleep(0.5)
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(args.concurrency) as executor:
+                results = list(executor.map(
+                    lambda index: send_request(http_port, index, args.post_ratio, run_id),
+                    range(args.requests),
+                ))
+            elapsed = time.perf_counter() - started
+
+            accepted = {index for method, index, status, _ in results if method == 'POST' and status == 302}
+            stored = wait_for_storage(storage_dir, run_id, len(accepted), args.drain_timeout)
+        finally:
+            stop(http_server)
+            stop(udp_server)
+
+        report(results, elapsed, accepted, stored)
+
+
+if __name__ == '__main__':
+    main()
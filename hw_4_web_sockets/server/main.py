@@ -1,18 +1,40 @@
-import mimetypes
+from http.server import HTTPServer, ThreadingHTTPServer, BaseHTTPRequestHandler
+import argparse
+import json
 import pathlib
-from http.server import HTTPServer, BaseHTTPRequestHandler
 import urllib.parse
 import socket
-from sockets.socket_client import run_client
+from sockets.form import MAX_BODY_SIZE, FormError, parse_form, encode_message
+from sockets.socket_client import UDPClient
+from sockets.storage import STORAGE_DIR, MessageIndex
+from static_cache import StaticCache
 
 
+MAX_PER_PAGE = 500
+
+static_cache = StaticCache('public')
+udp_client = None
+message_index = MessageIndex()
+
 
 class HttpHandler(BaseHTTPRequestHandler):
     def do_POST(self):
-        data = self.rfile.read(int(self.headers['Content-Length']))
-        data_parse = urllib.parse.unquote_plus(data.decode())
-        run_client(data_parse)
-        data_dict = {key: value for key, value in [el.split('=') for el in data_parse.split('&')]}
+        try:
+            length = int(self.headers['Content-Length'])
+        except (TypeError, ValueError):
+            self.send_error(411)
+            return
+        if length < 0 or length > MAX_BODY_SIZE:
+            self.send_error(413)
+            return
+
+        try:
+            data_dict = parse_form(self.rfile.read(length))
+        except FormError as e:
+            self.send_error(400, str(e))
+            return
+
+        udp_client.send(encode_message(data_dict))
         self.send_response(302)
         self.send_header('Location', '/')
         self.end_headers()
@@ -20,42 +42,141 @@ class HttpHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         pr_url = urllib.parse.urlparse(self.path)
         if pr_url.path == '/':
-            self.send_html_file('public/index.html')
+            self.send_html_file('index.html')
         elif pr_url.path == '/message':
-            self.send_html_file('public/message.html')
+            self.send_html_file('message.html')
+        elif pr_url.path == '/messages':
+            self.send_messages(urllib.parse.parse_qs(pr_url.query))
         else:
-            if pathlib.Path().joinpath(f"public/{pr_url.path[1:]}").exists():
-                self.send_static()
+            entry = static_cache.get(pr_url.path)
+            if entry is not None:
+                self.send_static(entry)
             else:
-                self.send_html_file('public/error.html', 404)
+                self.send_html_file('error.html', 404)
+
+    def send_messages(self, query):
+        try:
+            page = int(query.get('page', ['1'])[0])
+            per_page = int(query.get('per_page', ['50'])[0])
+            if page < 1 or not 1 <= per_page <= MAX_PER_PAGE:
+                raise ValueError
+        except ValueError:
+            self.send_json({'error': f'page must be >= 1 and per_page between 1 and {MAX_PER_PAGE}'}, 400)
+            return
+
+        message_index.refresh()
+        total, messages = message_index.query(
+            start=query.get('from', [None])[0],
+            end=query.get('to', [None])[0],
+            username=query.get('username', [None])[0],
+            offset=(page - 1) * per_page,
+            limit=per_page,
+        )
+        self.send_json({'total': total, 'page': page, 'per_page': per_page, 'messages': messages})
+
+    def send_json(self, obj, status=200):
+        body = json.dumps(obj, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
     def send_html_file(self, filename, status=200):
+        self.send_static(static_cache.get(filename), status)
+
+    def send_static(self, entry, status=200):
+        if status == 200 and entry.is_not_modified(self.headers):
+            self.send_response(304)
+            self.send_header('ETag', entry.etag)
+            self.send_header('Last-Modified', entry.last_modified)
+            self.end_headers()
+            return
+
+        byte_range = None
+        if status == 200:
+            try:
+                byte_range = entry.byte_range(self.headers)
+            except ValueError:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{entry.size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+        if byte_range is not None or entry.data is None:
+            self.send_file(entry, status, byte_range)
+            return
+
+        body, etag = entry.data, entry.etag
+        use_gzip = entry.gzip_data is not None and 'gzip' in self.headers.get('Accept-Encoding', '')
+        if use_gzip:
+            body, etag = entry.gzip_data, entry.gzip_etag
+
         self.send_response(status)
-        self.send_header('Content-type', 'text/html')
+        self.send_header('Content-type', entry.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if status == 200:
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', entry.last_modified)
+            self.send_header('Accept-Ranges', 'bytes')
+        if entry.gzip_data is not None:
+            self.send_header('Vary', 'Accept-Encoding')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
         self.end_headers()
-        with open(filename, 'rb') as fd:
-            self.wfile.write(fd.read())
-
-    def send_static(self):
-        self.send_response(200)
-        mt = mimetypes.guess_type(self.path)
-        if mt:
-            self.send_header("Content-type", mt[0])
+        self.wfile.write(body)
+
+    def send_file(self, entry, status=200, byte_range=None):
+        start, end = byte_range if byte_range is not None else (0, entry.size - 1)
+        count = end - start + 1
+
+        if byte_range is not None:
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{entry.size}')
         else:
-            self.send_header("Content-type", 'text/plain')
+            self.send_response(status)
+        self.send_header('Content-type', entry.content_type)
+        self.send_header('Content-Length', str(count))
+        if status == 200:
+            self.send_header('ETag', entry.etag)
+            self.send_header('Last-Modified', entry.last_modified)
+            self.send_header('Accept-Ranges', 'bytes')
         self.end_headers()
-        with open(f'public{self.path}', 'rb') as file:
-            self.wfile.write(file.read())
 
+        if count <= 0:
+            return
 
-def run(server_class=HTTPServer, handler_class=HttpHandler):
-    server_address = ('0.0.0.0', 3000)
+        if entry.data is not None:
+            self.wfile.write(entry.data[start:end + 1])
+            return
+
+        with open(entry.path, 'rb') as file:
+            self.connection.sendfile(file, start, count)
+
+
+def run(server_class=HTTPServer, handler_class=HttpHandler, port=3000, udp_port=5000, batch=False):
+    global udp_client
+    udp_client = UDPClient(UDP_PORT=udp_port, batch=batch)
+
+    server_address = ('0.0.0.0', port)
     http = server_class(server_address, handler_class)
     try:
         http.serve_forever()
     except KeyboardInterrupt:
         http.server_close()
+    finally:
+        udp_client.close()
 
 
 if __name__ == '__main__':
-    run()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--udp-port', type=int, default=5000)
+    parser.add_argument('--storage-dir', type=pathlib.Path, default=STORAGE_DIR)
+    parser.add_argument('--threaded', action='store_true')
+    parser.add_argument('--batch', action='store_true', help='pack messages into shared UDP datagrams, adds up to 5 ms latency')
+    args = parser.parse_args()
+
+    message_index = MessageIndex(args.storage_dir)
+    run(ThreadingHTTPServer if args.threaded else HTTPServer, port=args.port, udp_port=args.udp_port, batch=args.batch)
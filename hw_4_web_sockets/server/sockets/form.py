@@ -0,0 +1,55 @@
+import json
+from urllib.parse import parse_qsl
+
+
+MAX_BODY_SIZE = 16 * 1024
+MAX_FIELDS = 8
+MAX_FIELD_LENGTH = 4096
+REQUIRED_FIELDS = ('username', 'message')
+
+
+class FormError(ValueError):
+    pass
+
+
+def parse_form(body, max_fields=MAX_FIELDS, max_field_length=MAX_FIELD_LENGTH):
+    if not body:
+        raise FormError('Request body is empty')
+    if len(body) > MAX_BODY_SIZE:
+        raise FormError('Request body is too large')
+
+    try:
+        pairs = parse_qsl(body.decode(), keep_blank_values=True, strict_parsing=True, max_num_fields=max_fields, errors='strict')
+    except UnicodeDecodeError:
+        raise FormError('Request body is not valid UTF-8')
+    except ValueError as e:
+        raise FormError(str(e))
+
+    fields = {}
+    for key, value in pairs:
+        if key in fields:
+            raise FormError(f'Duplicate field: {key}')
+        if len(key) > max_field_length or len(value) > max_field_length:
+            raise FormError(f'Field is too long: {key[:64]}')
+        fields[key] = value
+
+    check_required(fields)
+    return fields
+
+
+def check_required(fields):
+    missing = [name for name in REQUIRED_FIELDS if not str(fields.get(name, '')).strip()]
+    if missing:
+        raise FormError(f'Missing required fields: {", ".join(missing)}')
+
+
+def encode_message(fields):
+    return json.dumps(fields, ensure_ascii=False, separators=(',', ':'))
+
+
+def decode_message(message):
+    fields = json.loads(message)
+    if not isinstance(fields, dict):
+        raise ValueError('Message must be a JSON object')
+    check_required(fields)
+    return fields
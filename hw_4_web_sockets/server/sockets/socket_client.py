@@ -1,10 +1,75 @@
 import socket
+import threading
+import time
 
 
-def run_client(data, UDP_IP = '127.0.0.1', UDP_PORT = 5000):
-    print(data)
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    server = UDP_IP, UDP_PORT
-    sock.sendto(data.encode(), server)
-    print(f'Send data: {data} to server: {server}')
-    sock.close()
\ No newline at end of file
+class UDPClient:
+    def __init__(self, UDP_IP = '127.0.0.1', UDP_PORT = 5000, batch = False, max_datagram = 1024, flush_interval = 0.005):
+        self.server = UDP_IP, UDP_PORT
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.batch = batch
+        self.max_datagram = max_datagram
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.buffer_size = 0
+        self.first_at = 0.0
+        self.closed = False
+        self.cond = threading.Condition()
+        self.flusher = None
+
+        if batch:
+            # One long-lived thread flushes partial batches once flush_interval has passed
+            self.flusher = threading.Thread(target=self.run_flusher, daemon=True)
+            self.flusher.start()
+
+    def send(self, data):
+        payload = data.encode()
+
+        if not self.batch or len(payload) >= self.max_datagram:
+            self.sock.sendto(payload, self.server)
+            return
+
+        with self.cond:
+            if self.buffer and self.buffer_size + len(payload) + 1 > self.max_datagram:
+                self._flush()
+
+            if not self.buffer:
+                self.first_at = time.monotonic()
+                self.cond.notify()
+
+            self.buffer.append(payload)
+            self.buffer_size += len(payload) + 1
+
+    def run_flusher(self):
+        with self.cond:
+            while not self.closed:
+                if not self.buffer:
+                    self.cond.wait()
+                    continue
+
+                remaining = self.first_at + self.flush_interval - time.monotonic()
+                if remaining > 0:
+                    self.cond.wait(remaining)
+                    continue
+
+                self._flush()
+
+    def flush(self):
+        with self.cond:
+            self._flush()
+
+    def _flush(self):
+        if self.buffer:
+            self.sock.sendto(b'\n'.join(self.buffer), self.server)
+            self.buffer = []
+            self.buffer_size = 0
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self._flush()
+            self.cond.notify()
+
+        if self.flusher is not None:
+            self.flusher.join()
+        self.sock.close()
@@ -1,37 +1,193 @@
+import argparse
+import asyncio
+import multiprocessing
+import pathlib
 import socket
-from datetime import datetime
-import json
+from datetime import datetime, timedelta
+from form import decode_message
+from storage import STORAGE_DIR, TIMESTAMP_FORMAT, JsonLinesStorage, import_json, export_json, segment_paths
 
 UDP_IP = '127.0.0.1'
 UDP_PORT = 5000
+MAX_DATAGRAM = 65535
 
 
-def run_server(ip, port):
+def open_storage(log_path=STORAGE_DIR / 'data.jsonl', json_path=STORAGE_DIR / 'data.json', import_legacy=None):
+    if import_legacy is None:
+        import_legacy = not segment_paths(log_path.parent)
+    storage = JsonLinesStorage(log_path)
+
+    if import_legacy and json_path.exists():
+        import_json(json_path, storage)
+
+    return storage
+
+
+def run_server(ip, port, storage=None):
+    storage = storage or open_storage()
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     server = ip, port
     sock.bind(server)
+    sock.settimeout(storage.fsync_interval)
     try:
         while True:
-            data, address = sock.recvfrom(1024)
-            current_datetime = datetime.now()
-            data_dict = {current_datetime.strftime("%Y-%m-%d %H:%M:%S.%f"): {key: value for key, value in [el.split("=") for el in data.decode().split("&")]}}
+            try:
+                data, address = sock.recvfrom(MAX_DATAGRAM)
+            except socket.timeout:
+                storage.sync()
+                continue
+
+            for message in data.decode().split('\n'):
+                current_datetime = datetime.now()
+                try:
+                    data_dict = decode_message(message)
+                except ValueError:
+                    continue
+                storage.append(current_datetime.strftime(TIMESTAMP_FORMAT), data_dict)
+                print(f'Received data: {data_dict} from: {address}')
+    except KeyboardInterrupt:
+        print(f'Destroy server')
+    finally:
+        storage.close()
+        sock.close()
+
+
+class IngestProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server):
+        self.server = server
+
+    def datagram_received(self, data, addr):
+        self.server.received += 1
+        try:
+            self.server.queue.put_nowait((datetime.now(), data))
+        except asyncio.QueueFull:
+            self.server.dropped += 1
+
+
+class IngestServer:
+    def __init__(self, ip, port, storage, queue_size=10000, batch_size=500, rcvbuf=4 * 1024 * 1024, reuse_port=False):
+        self.ip = ip
+        self.port = port
+        self.storage = storage
+        self.reuse_port = reuse_port
+        self.batch_size = batch_size
+        self.rcvbuf = rcvbuf
+        self.queue = asyncio.Queue(queue_size)
+        self.received = 0
+        self.dropped = 0
+        self.written = 0
+        self.errors = 0
+        self.last_timestamp = datetime.min
+        self.transport = None
+
+    def stats(self):
+        return {
+            'received': self.received,
+            'dropped': self.dropped,
+            'written': self.written,
+            'errors': self.errors,
+            'queue_depth': self.queue.qsize(),
+        }
 
-            dictObj = {}
+    def create_socket(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+        if self.reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((self.ip, self.port))
+        return sock
 
-            with open('../../storage/data.json', 'r') as fp:
-                dictObj = json.load(fp)
+    def write_batch(self, batch):
+        for received_at, data in batch:
+            for message in data.decode().split('\n'):
+                try:
+                    data_dict = decode_message(message)
+                except ValueError:
+                    self.errors += 1
+                    continue
 
-            dictObj[current_datetime.strftime("%Y-%m-%d %H:%M:%S.%f")] = {key: value for key, value in [el.split("=") for el in data.decode().split("&")]}
+                timestamp = max(received_at, self.last_timestamp + timedelta(microseconds=1))
+                self.last_timestamp = timestamp
+                self.storage.append(timestamp.strftime(TIMESTAMP_FORMAT), data_dict)
+                self.written += 1
+        self.storage.sync()
+
+    async def write_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            await loop.run_in_executor(None, self.write_batch, batch)
+            for _ in batch:
+                self.queue.task_done()
+
+    async def serve_forever(self):
+        loop = asyncio.get_running_loop()
+        self.transport, _ = await loop.create_datagram_endpoint(lambda: IngestProtocol(self), sock=self.create_socket())
+        writer = asyncio.create_task(self.write_batches())
+        try:
+            await asyncio.Future()
+        finally:
+            self.transport.close()
+            await self.queue.join()
+            writer.cancel()
 
-            with open('../../storage/data.json', "w") as fh:
-                json.dump(dictObj, fh, indent = 4, separators=(',', ': '))
 
-            print(f'Received data: {data_dict} from: {address}')
+def run_async_server(ip, port, storage=None, reuse_port=False):
+    storage = storage or open_storage()
+    server = IngestServer(ip, port, storage, reuse_port=reuse_port)
+    try:
+        asyncio.run(server.serve_forever())
     except KeyboardInterrupt:
         print(f'Destroy server')
     finally:
-        sock.close()
+        storage.close()
+        print(f'Ingest stats: {server.stats()}')
+
+
+def run_worker(ip, port, index, import_legacy, storage_dir=STORAGE_DIR):
+    storage = open_storage(storage_dir / f'data.{index}.jsonl', storage_dir / 'data.json', import_legacy)
+    run_async_server(ip, port, storage, reuse_port=True)
+
+
+def run_workers(ip, port, workers=multiprocessing.cpu_count(), storage_dir=STORAGE_DIR):
+    if not hasattr(socket, 'SO_REUSEPORT'):
+        raise RuntimeError('SO_REUSEPORT is not supported on this platform')
+
+    import_legacy = not segment_paths(storage_dir)
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(ip, port, index, import_legacy and index == 0, storage_dir))
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
 
 
 if __name__ == "__main__":
-    run_server(UDP_IP, UDP_PORT)
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument('command', nargs='?', choices=['serve', 'sync', 'export'], default='serve')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--port', type=int, default=UDP_PORT)
+    parser.add_argument('--storage-dir', type=pathlib.Path, default=STORAGE_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        count = export_json(segment_paths(args.storage_dir), args.storage_dir / 'data.json')
+        print(f'Exported {count} messages to {args.storage_dir / "data.json"}')
+    elif args.workers > 1:
+        run_workers(UDP_IP, args.port, args.workers, args.storage_dir)
+    else:
+        storage = open_storage(args.storage_dir / 'data.jsonl', args.storage_dir / 'data.json')
+        if args.command == 'sync':
+            run_server(UDP_IP, args.port, storage)
+        else:
+            run_async_server(UDP_IP, args.port, storage)
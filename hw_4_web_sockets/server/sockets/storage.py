@@ -0,0 +1,192 @@
+import bisect
+import heapq
+import json
+import os
+import pathlib
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+STORAGE_DIR = pathlib.Path(__file__).resolve().parents[2] / 'storage'
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+class JsonLinesStorage:
+    def __init__(self, path=STORAGE_DIR / 'data.jsonl', fsync_every=100, fsync_interval=1.0):
+        self.path = pathlib.Path(path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.pending = 0
+        self.last_sync = time.monotonic()
+        self.file = open(self.path, 'a', encoding='utf-8')
+
+    def append(self, timestamp, record):
+        self.file.write(json.dumps({'timestamp': timestamp, 'data': record}, ensure_ascii=False, separators=(',', ':')))
+        self.file.write('\n')
+        self.pending += 1
+
+        if self.pending >= self.fsync_every or time.monotonic() - self.last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        if self.pending:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        self.sync()
+        self.file.close()
+
+
+def read_records(path):
+    with open(path, 'r', encoding='utf-8') as fh:
+        for line in fh:
+            if not line.endswith('\n'):
+                break
+            item = json.loads(line)
+            yield item['timestamp'], item['data']
+
+
+def import_json(json_path, storage):
+    with open(json_path, 'r', encoding='utf-8') as fp:
+        dictObj = json.load(fp)
+
+    for timestamp, record in dictObj.items():
+        storage.append(timestamp, record)
+    storage.sync()
+
+
+def segment_paths(storage_dir=STORAGE_DIR):
+    return sorted(pathlib.Path(storage_dir).glob('data*.jsonl'))
+
+
+def merge_segments(paths):
+    return heapq.merge(*(read_records(path) for path in paths), key=lambda item: item[0])
+
+
+def export_json(log_paths=None, json_path=STORAGE_DIR / 'data.json'):
+    if log_paths is None:
+        log_paths = segment_paths()
+
+    dictObj = {}
+    for timestamp, record in merge_segments(log_paths):
+        while timestamp in dictObj:
+            timestamp = (datetime.strptime(timestamp, TIMESTAMP_FORMAT) + timedelta(microseconds=1)).strftime(TIMESTAMP_FORMAT)
+        dictObj[timestamp] = record
+
+    tmp_path = pathlib.Path(f'{json_path}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(dictObj, fh, indent = 4, separators=(',', ': '))
+    os.replace(tmp_path, json_path)
+
+    return len(dictObj)
+
+
+class MessageIndex:
+    def __init__(self, storage_dir=STORAGE_DIR):
+        self.storage_dir = pathlib.Path(storage_dir)
+        self.offsets = {}
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        self.offsets.clear()
+        self.timestamps = []
+        self.records = []
+        self.by_username = {}
+
+    def add(self, timestamp, record):
+        insort(self.timestamps, self.records, timestamp, record)
+        username = record.get('username')
+        if username is not None:
+            timestamps, records = self.by_username.setdefault(username, ([], []))
+            insort(timestamps, records, timestamp, record)
+
+    def append(self, timestamp, record):
+        self.timestamps.append(timestamp)
+        self.records.append(record)
+        username = record.get('username')
+        if username is not None:
+            timestamps, records = self.by_username.setdefault(username, ([], []))
+            timestamps.append(timestamp)
+            records.append(record)
+
+    def refresh(self):
+        with self.lock:
+            self._refresh()
+
+    def _refresh(self):
+        paths = segment_paths(self.storage_dir)
+        if not self.offsets:
+            return self.build(paths)
+
+        for path in paths:
+            file_stat = os.stat(path)
+            inode, offset = self.offsets.get(path, (file_stat.st_ino, 0))
+            if inode != file_stat.st_ino or file_stat.st_size < offset:
+                self.reset()
+                return self._refresh()
+
+            if file_stat.st_size > offset:
+                offset = self.read_from(path, offset, self.add)
+            self.offsets[path] = inode, offset
+
+        if set(self.offsets) - set(paths):
+            self.reset()
+            self._refresh()
+
+    def build(self, paths):
+        # Worker segments interleave in time, so sort once instead of inserting mid-list
+        items = []
+        for path in paths:
+            inode = os.stat(path).st_ino
+            offset = self.read_from(path, 0, lambda timestamp, record: items.append((timestamp, record)))
+            self.offsets[path] = inode, offset
+
+        items.sort(key=lambda item: item[0])
+        for timestamp, record in items:
+            self.append(timestamp, record)
+
+    def read_from(self, path, offset, add):
+        with open(path, 'rb') as fh:
+            fh.seek(offset)
+            for line in fh:
+                if not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                item = json.loads(line)
+                add(item['timestamp'], item['data'])
+        return offset
+
+    def query(self, start=None, end=None, username=None, offset=0, limit=50):
+        with self.lock:
+            return self._query(start, end, username, offset, limit)
+
+    def _query(self, start, end, username, offset, limit):
+        if username is None:
+            timestamps, records = self.timestamps, self.records
+        else:
+            timestamps, records = self.by_username.get(username, ([], []))
+
+        lo = bisect.bisect_left(timestamps, start) if start else 0
+        hi = bisect.bisect_left(timestamps, end) if end else len(timestamps)
+        hi = max(lo, hi)
+
+        items = [
+            {'timestamp': timestamps[i], **records[i]}
+            for i in range(lo + offset, min(lo + offset + limit, hi))
+        ]
+        return hi - lo, items
+
+
+def insort(timestamps, records, timestamp, record):
+    if not timestamps or timestamp >= timestamps[-1]:
+        timestamps.append(timestamp)
+        records.append(record)
+    else:
+        i = bisect.bisect_right(timestamps, timestamp)
+        timestamps.insert(i, timestamp)
+        records.insert(i, record)
@@ -0,0 +1,146 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import pathlib
+import stat
+import time
+from email.utils import formatdate, parsedate_to_datetime
+
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+
+class Entry:
+    def __init__(self, size, mtime, content_type, etag):
+        self.size = size
+        self.mtime = mtime
+        self.content_type = content_type
+        self.etag = etag
+        self.gzip_etag = f'{etag[:-1]}-gzip"'
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.data = None
+        self.gzip_data = None
+        self.checked = time.monotonic()
+
+    def matches(self, validator):
+        tags = [tag.strip() for tag in validator.split(',')]
+        etags = (self.etag, self.gzip_etag, f'W/{self.etag}', f'W/{self.gzip_etag}')
+        return '*' in tags or any(tag in etags for tag in tags)
+
+    def is_not_modified(self, headers):
+        if_none_match = headers.get('If-None-Match')
+        if if_none_match:
+            return self.matches(if_none_match)
+
+        if_modified_since = headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self.mtime) <= since
+
+        return False
+
+    def byte_range(self, headers):
+        range_header = headers.get('Range')
+        if not range_header:
+            return None
+
+        if_range = headers.get('If-Range')
+        if if_range and if_range != self.etag and if_range != self.last_modified:
+            return None
+
+        return parse_range(range_header, self.size)
+
+
+class CacheEntry(Entry):
+    def __init__(self, data, mtime, content_type):
+        super().__init__(len(data), mtime, content_type, f'"{hashlib.sha1(data).hexdigest()}"')
+        self.data = data
+
+        if content_type.startswith(COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(data, mtime=0)
+            if len(compressed) < len(data):
+                self.gzip_data = compressed
+
+
+class FileEntry(Entry):
+    def __init__(self, path, size, mtime, content_type):
+        super().__init__(size, mtime, content_type, f'"{size:x}-{int(mtime * 1000000):x}"')
+        self.path = path
+
+
+def parse_range(header, size):
+    unit, _, spec = header.partition('=')
+    if unit.strip() != 'bytes' or ',' in spec:
+        return None
+
+    start, _, end = spec.strip().partition('-')
+    try:
+        if start:
+            start = int(start)
+            end = int(end) if end else size - 1
+        else:
+            length = int(end)
+            if length <= 0:
+                raise ValueError
+            start = max(size - length, 0)
+            end = size - 1
+    except ValueError:
+        raise ValueError('Range not satisfiable')
+
+    if start > end or start >= size:
+        raise ValueError('Range not satisfiable')
+
+    return start, min(end, size - 1)
+
+
+class StaticCache:
+    def __init__(self, root='public', check_interval=1.0, max_cached_size=256 * 1024):
+        self.root = pathlib.Path(root).resolve()
+        self.check_interval = check_interval
+        self.max_cached_size = max_cached_size
+        self.entries = {}
+
+    def resolve(self, name):
+        path = (self.root / name.lstrip('/')).resolve()
+        if path != self.root and self.root not in path.parents:
+            return None
+        return path
+
+    def get(self, name):
+        path = self.resolve(name)
+        if path is None:
+            return None
+
+        entry = self.entries.get(path)
+        now = time.monotonic()
+        if entry is not None and now - entry.checked < self.check_interval:
+            return entry
+
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            self.entries.pop(path, None)
+            return None
+
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+
+        if entry is not None and entry.mtime == file_stat.st_mtime and entry.size == file_stat.st_size:
+            entry.checked = now
+            return entry
+
+        content_type = mimetypes.guess_type(path)[0] or 'text/plain'
+
+        if file_stat.st_size > self.max_cached_size:
+            entry = FileEntry(path, file_stat.st_size, file_stat.st_mtime, content_type)
+        else:
+            with open(path, 'rb') as file:
+                data = file.read()
+            entry = CacheEntry(data, file_stat.st_mtime, content_type)
+
+        self.entries[path] = entry
+        return entry
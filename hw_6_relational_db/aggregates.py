@@ -0,0 +1,207 @@
+import sqlite3
+import logging
+from contextlib import contextmanager
+
+
+SUMMARY_TABLES = {
+    "score_student_summary": """
+        CREATE TABLE IF NOT EXISTS score_student_summary (
+            student_id_fn integer PRIMARY KEY NOT NULL,
+            total REAL NOT NULL,
+            cnt integer NOT NULL
+        )""",
+    "score_student_lesson_summary": """
+        CREATE TABLE IF NOT EXISTS score_student_lesson_summary (
+            student_id_fn integer NOT NULL,
+            lesson_id_fn integer NOT NULL,
+            total REAL NOT NULL,
+            cnt integer NOT NULL,
+            PRIMARY KEY(student_id_fn, lesson_id_fn)
+        ) WITHOUT ROWID""",
+    "score_groupe_lesson_summary": """
+        CREATE TABLE IF NOT EXISTS score_groupe_lesson_summary (
+            groupe_id_fn integer NOT NULL,
+            lesson_id_fn integer NOT NULL,
+            total REAL NOT NULL,
+            cnt integer NOT NULL,
+            PRIMARY KEY(groupe_id_fn, lesson_id_fn)
+        ) WITHOUT ROWID""",
+    "score_teacher_summary": """
+        CREATE TABLE IF NOT EXISTS score_teacher_summary (
+            teacher_id_fn integer PRIMARY KEY NOT NULL,
+            total REAL NOT NULL,
+            cnt integer NOT NULL
+        )""",
+}
+
+SUMMARY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_score_student_summary_avg ON score_student_summary(total * 1.0 / cnt)",
+    "CREATE INDEX IF NOT EXISTS idx_score_student_lesson_summary_lesson ON score_student_lesson_summary(lesson_id_fn, student_id_fn, total, cnt)",
+]
+
+
+def add_score(ref: str) -> str:
+    return f"""
+        INSERT INTO score_student_summary(student_id_fn, total, cnt)
+        SELECT {ref}.student_id_fn, {ref}.score, 1 WHERE {ref}.student_id_fn IS NOT NULL
+        ON CONFLICT(student_id_fn) DO UPDATE SET total = total + excluded.total, cnt = cnt + 1;
+
+        INSERT INTO score_student_lesson_summary(student_id_fn, lesson_id_fn, total, cnt)
+        SELECT {ref}.student_id_fn, {ref}.lesson_id_fn, {ref}.score, 1 WHERE {ref}.student_id_fn IS NOT NULL AND {ref}.lesson_id_fn IS NOT NULL
+        ON CONFLICT(student_id_fn, lesson_id_fn) DO UPDATE SET total = total + excluded.total, cnt = cnt + 1;
+
+        INSERT INTO score_groupe_lesson_summary(groupe_id_fn, lesson_id_fn, total, cnt)
+        SELECT st.groupe_id_fn, {ref}.lesson_id_fn, {ref}.score, 1 FROM student st
+        WHERE st.id = {ref}.student_id_fn AND st.groupe_id_fn IS NOT NULL AND {ref}.lesson_id_fn IS NOT NULL
+        ON CONFLICT(groupe_id_fn, lesson_id_fn) DO UPDATE SET total = total + excluded.total, cnt = cnt + 1;
+
+        INSERT INTO score_teacher_summary(teacher_id_fn, total, cnt)
+        SELECT l.teacher_id_fn, {ref}.score, 1 FROM lesson l
+        WHERE l.id = {ref}.lesson_id_fn AND l.teacher_id_fn IS NOT NULL
+        ON CONFLICT(teacher_id_fn) DO UPDATE SET total = total + excluded.total, cnt = cnt + 1;"""
+
+
+def remove_score(ref: str) -> str:
+    keys = {
+        "score_student_summary": f"student_id_fn = {ref}.student_id_fn",
+        "score_student_lesson_summary": f"student_id_fn = {ref}.student_id_fn AND lesson_id_fn = {ref}.lesson_id_fn",
+        "score_groupe_lesson_summary": f"groupe_id_fn = (SELECT groupe_id_fn FROM student WHERE id = {ref}.student_id_fn) AND lesson_id_fn = {ref}.lesson_id_fn",
+        "score_teacher_summary": f"teacher_id_fn = (SELECT teacher_id_fn FROM lesson WHERE id = {ref}.lesson_id_fn)",
+    }
+
+    return "".join(f"""
+        UPDATE {table_name} SET total = total - {ref}.score, cnt = cnt - 1 WHERE {where};
+        DELETE FROM {table_name} WHERE {where} AND cnt = 0;
+""" for table_name, where in keys.items())
+
+
+TRIGGERS = {
+    "score_summary_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS score_summary_insert AFTER INSERT ON score
+        WHEN NEW.score IS NOT NULL
+        BEGIN {add_score("NEW")}
+        END""",
+    "score_summary_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS score_summary_delete AFTER DELETE ON score
+        WHEN OLD.score IS NOT NULL
+        BEGIN {remove_score("OLD")}
+        END""",
+    "score_summary_update_old": f"""
+        CREATE TRIGGER IF NOT EXISTS score_summary_update_old AFTER UPDATE OF score, student_id_fn, lesson_id_fn ON score
+        WHEN OLD.score IS NOT NULL
+        BEGIN {remove_score("OLD")}
+        END""",
+    "score_summary_update_new": f"""
+        CREATE TRIGGER IF NOT EXISTS score_summary_update_new AFTER UPDATE OF score, student_id_fn, lesson_id_fn ON score
+        WHEN NEW.score IS NOT NULL
+        BEGIN {add_score("NEW")}
+        END""",
+    "student_groupe_summary": """
+        CREATE TRIGGER IF NOT EXISTS student_groupe_summary AFTER UPDATE OF groupe_id_fn ON student
+        WHEN OLD.groupe_id_fn IS NOT NEW.groupe_id_fn
+        BEGIN
+            UPDATE score_groupe_lesson_summary
+            SET total = total - (SELECT s.total FROM score_student_lesson_summary s WHERE s.student_id_fn = NEW.id AND s.lesson_id_fn = score_groupe_lesson_summary.lesson_id_fn),
+                cnt = cnt - (SELECT s.cnt FROM score_student_lesson_summary s WHERE s.student_id_fn = NEW.id AND s.lesson_id_fn = score_groupe_lesson_summary.lesson_id_fn)
+            WHERE groupe_id_fn = OLD.groupe_id_fn
+            AND lesson_id_fn IN (SELECT lesson_id_fn FROM score_student_lesson_summary WHERE student_id_fn = NEW.id);
+
+            DELETE FROM score_groupe_lesson_summary WHERE groupe_id_fn = OLD.groupe_id_fn AND cnt = 0;
+
+            INSERT INTO score_groupe_lesson_summary(groupe_id_fn, lesson_id_fn, total, cnt)
+            SELECT NEW.groupe_id_fn, s.lesson_id_fn, s.total, s.cnt FROM score_student_lesson_summary s
+            WHERE s.student_id_fn = NEW.id AND NEW.groupe_id_fn IS NOT NULL
+            ON CONFLICT(groupe_id_fn, lesson_id_fn) DO UPDATE SET total = total + excluded.total, cnt = cnt + excluded.cnt;
+        END""",
+    "lesson_teacher_summary": """
+        CREATE TRIGGER IF NOT EXISTS lesson_teacher_summary AFTER UPDATE OF teacher_id_fn ON lesson
+        WHEN OLD.teacher_id_fn IS NOT NEW.teacher_id_fn
+        BEGIN
+            UPDATE score_teacher_summary
+            SET total = total - (SELECT COALESCE(SUM(total), 0) FROM score_student_lesson_summary WHERE lesson_id_fn = NEW.id),
+                cnt = cnt - (SELECT COALESCE(SUM(cnt), 0) FROM score_student_lesson_summary WHERE lesson_id_fn = NEW.id)
+            WHERE teacher_id_fn = OLD.teacher_id_fn;
+
+            DELETE FROM score_teacher_summary WHERE teacher_id_fn = OLD.teacher_id_fn AND cnt = 0;
+
+            INSERT INTO score_teacher_summary(teacher_id_fn, total, cnt)
+            SELECT NEW.teacher_id_fn, SUM(total), SUM(cnt) FROM score_student_lesson_summary
+            WHERE lesson_id_fn = NEW.id AND NEW.teacher_id_fn IS NOT NULL
+            GROUP BY lesson_id_fn
+            ON CONFLICT(teacher_id_fn) DO UPDATE SET total = total + excluded.total, cnt = cnt + excluded.cnt;
+        END""",
+}
+
+REBUILD = [
+    """
+    INSERT INTO score_student_summary(student_id_fn, total, cnt)
+    SELECT student_id_fn, SUM(score), COUNT(score) FROM score
+    WHERE student_id_fn IS NOT NULL AND score IS NOT NULL
+    GROUP BY student_id_fn""",
+    """
+    INSERT INTO score_student_lesson_summary(student_id_fn, lesson_id_fn, total, cnt)
+    SELECT student_id_fn, lesson_id_fn, SUM(score), COUNT(score) FROM score
+    WHERE student_id_fn IS NOT NULL AND lesson_id_fn IS NOT NULL AND score IS NOT NULL
+    GROUP BY student_id_fn, lesson_id_fn""",
+    """
+    INSERT INTO score_groupe_lesson_summary(groupe_id_fn, lesson_id_fn, total, cnt)
+    SELECT st.groupe_id_fn, s.lesson_id_fn, SUM(s.total), SUM(s.cnt) FROM score_student_lesson_summary s
+    INNER JOIN student st ON st.id = s.student_id_fn
+    WHERE st.groupe_id_fn IS NOT NULL
+    GROUP BY st.groupe_id_fn, s.lesson_id_fn""",
+    """
+    INSERT INTO score_teacher_summary(teacher_id_fn, total, cnt)
+    SELECT l.teacher_id_fn, SUM(s.score), COUNT(s.score) FROM score s
+    INNER JOIN lesson l ON l.id = s.lesson_id_fn
+    WHERE l.teacher_id_fn IS NOT NULL AND s.score IS NOT NULL
+    GROUP BY l.teacher_id_fn""",
+]
+
+
+def execute_all(conn: sqlite3.Connection, sql_requests: list[str]) -> None:
+    for sql_request in sql_requests:
+        logging.debug(sql_request)
+        conn.execute(sql_request)
+
+
+def rebuild(conn: sqlite3.Connection) -> None:
+    with conn:
+        execute_all(conn, [f"DELETE FROM {table_name}" for table_name in SUMMARY_TABLES])
+        execute_all(conn, REBUILD)
+
+
+def install(conn: sqlite3.Connection) -> None:
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+    try:
+        with conn:
+            execute_all(conn, list(SUMMARY_TABLES.values()))
+            execute_all(conn, SUMMARY_INDEXES)
+            execute_all(conn, list(TRIGGERS.values()))
+    except sqlite3.Error as e:
+        print(e)
+        return
+
+    if not set(SUMMARY_TABLES) <= existing:
+        rebuild(conn)
+
+
+def drop_triggers(conn: sqlite3.Connection) -> None:
+    with conn:
+        execute_all(conn, [f"DROP TRIGGER IF EXISTS {name}" for name in TRIGGERS])
+
+
+@contextmanager
+def suspended(conn: sqlite3.Connection):
+    installed = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name = 'score_summary_insert'").fetchone()[0]
+
+    if not installed:
+        yield
+        return
+
+    drop_triggers(conn)
+    try:
+        yield
+    finally:
+        install(conn)
+        rebuild(conn)
@@ -0,0 +1,96 @@
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import time
+import aggregates
+from connection import PRAGMAS, connect
+from query_catalog import QueryCatalog
+from table import Table
+from student_table import StudentTable, Student
+from groupe_table import GroupeTable, Groupe
+from teacher_table import TeacherTable, Teacher
+from score_table import ScoreTable, Score
+from lesson_table import LessonTable, Lesson
+
+
+catalog = QueryCatalog()
+
+
+def seed(conn, students, lessons, scores_per_pair, single_rows):
+    Table.conn = conn
+
+    teacher_table = TeacherTable()
+    groupe_table = GroupeTable()
+    lesson_table = LessonTable()
+    student_table = StudentTable()
+    score_table = ScoreTable()
+
+    teacher_table.create_many(Teacher(i, f"Teacher {i}") for i in range(1, lessons + 1))
+    groupe_table.create_many(Groupe(i, f"Groupe {i}") for i in range(1, 4))
+    lesson_table.create_many(Lesson(i, f"Lesson {i}", random.randint(1, lessons)) for i in range(1, lessons + 1))
+    student_table.create_many(Student(i, f"Student {i}", random.randint(1, 3)) for i in range(1, students + 1))
+
+    start = time.perf_counter()
+    score_table.create_many(
+        Score(None, random.randint(0, 12), datetime.datetime(2024, 1, 1), j, i)
+        for i in range(1, lessons + 1)
+        for j in range(1, students + 1)
+        for _ in range(scores_per_pair)
+    )
+    bulk_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(single_rows):
+        score_table.create(Score(None, 6, datetime.datetime(2024, 1, 1), 1, 1))
+    single_time = time.perf_counter() - start
+
+    return bulk_time, single_time
+
+
+def run_queries(conn, repeat):
+    start = time.perf_counter()
+
+    for _ in range(repeat):
+        for query in catalog:
+            catalog.execute(conn, query.name)
+
+    return time.perf_counter() - start
+
+
+def run_profile(name, pragmas, args):
+    random.seed(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect(os.path.join(tmp, "bench.sqlite"), pragmas)
+        try:
+            bulk_time, single_time = seed(conn, args.students, args.lessons, args.scores, args.single_rows)
+            aggregates.install(conn)
+            query_time = run_queries(conn, args.repeat)
+        finally:
+            conn.close()
+
+    print(
+        f"{name:<8} bulk seed {bulk_time:8.3f}s | "
+        f"{args.single_rows} single-row commits {single_time:8.3f}s | "
+        f"12 queries x{args.repeat} {query_time:8.3f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare default and tuned SQLite connection profiles")
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--lessons", type=int, default=20)
+    parser.add_argument("--scores", type=int, default=10, help="scores per student and lesson")
+    parser.add_argument("--single-rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    run_profile("default", None, args)
+    run_profile("tuned", PRAGMAS, args)
+
+
+if __name__ == "__main__":
+    main()
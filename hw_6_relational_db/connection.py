@@ -0,0 +1,67 @@
+import sqlite3
+import logging
+
+
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64000,
+    "temp_store": "MEMORY",
+}
+
+READ_PRAGMAS = {
+    "query_only": 1,
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64000,
+    "temp_store": "MEMORY",
+}
+
+
+def connect(database: str, pragmas: dict[str, str | int] | None = PRAGMAS) -> sqlite3.Connection:
+    conn = sqlite3.connect(database, cached_statements=256)
+
+    for key, value in (pragmas or {}).items():
+        sql_request = f"PRAGMA {key}={value}"
+        logging.debug(sql_request)
+        conn.execute(sql_request)
+
+    return conn
+
+
+def connect_readonly(database: str, pragmas: dict[str, str | int] | None = READ_PRAGMAS) -> sqlite3.Connection:
+    conn = sqlite3.connect(f"file:{database}?mode=ro", uri=True, cached_statements=256, check_same_thread=False)
+
+    for key, value in (pragmas or {}).items():
+        sql_request = f"PRAGMA {key}={value}"
+        logging.debug(sql_request)
+        conn.execute(sql_request)
+
+    return conn
+
+
+class ConnectionPool:
+    def __init__(self, pragmas: dict[str, str | int] | None = PRAGMAS) -> None:
+        self.pragmas = pragmas
+        self.connections: dict[str, sqlite3.Connection] = {}
+
+    def get(self, database: str) -> sqlite3.Connection:
+        conn = self.connections.get(database)
+
+        if conn is None:
+            conn = connect(database, self.pragmas)
+            self.connections[database] = conn
+
+        return conn
+
+    def close_all(self) -> None:
+        for conn in self.connections.values():
+            conn.close()
+        self.connections.clear()
+
+
+pool = ConnectionPool()
+
+
+def get_connection(database: str) -> sqlite3.Connection:
+    return pool.get(database)
@@ -7,6 +7,8 @@ class Groupe:
     name: str
 
 class GroupeTable(Table):
+    row_type = Groupe
+
     def __init__(self):
         super().__init__("groupe",
         {
@@ -19,10 +21,4 @@ class GroupeTable(Table):
         return super().create(groupe.__dict__)
 
     def get_all(self) -> list[Groupe] | None:
-        result = []
-        rows = super.get_all()
-
-        for i in rows:
-            result.append(Groupe(*i))
-
-        return result
+        return list(self.iter_all())
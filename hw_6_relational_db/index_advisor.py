@@ -0,0 +1,123 @@
+import argparse
+import re
+import sqlite3
+import aggregates
+from connection import get_connection, pool
+from query_catalog import QueryCatalog
+from table import index_sql
+
+
+database = "test.sqlite"
+
+TABLE_ALIAS = re.compile(r"\b(?:from|join)\s+(\w+)(?:\s+as)?(?:\s+(?!on\b|where\b|left\b|right\b|inner\b|join\b|group\b|order\b|limit\b)(\w+))?", re.IGNORECASE)
+CONDITION = re.compile(r"\b(\w+)\.(\w+)(?=\s*=)|(?<==)\s*(\w+)\.(\w+)")
+
+
+def query_plan(conn, query):
+    params = {param: None for param in query.params}
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query.sql}", params)]
+
+
+def full_scans(plan):
+    scans = [detail.split()[1] for detail in plan if detail.startswith("SCAN ") and " USING " not in detail]
+    return list(dict.fromkeys(scans))
+
+
+def table_aliases(sql):
+    aliases = {}
+    for table, alias in TABLE_ALIAS.findall(sql):
+        aliases[alias or table] = table
+    return aliases
+
+
+def suggest_index(sql, alias):
+    key_columns = []
+    for match in CONDITION.finditer(sql):
+        name, column = (match.group(1), match.group(2)) if match.group(1) else (match.group(3), match.group(4))
+        if name == alias and column != "id" and column not in key_columns:
+            key_columns.append(column)
+
+    if not key_columns:
+        return ()
+
+    covered = [column for column in re.findall(rf"\b{alias}\.(\w+)", sql) if column != "id"]
+    columns = key_columns + [column for column in dict.fromkeys(covered) if column not in key_columns]
+
+    return tuple(columns)
+
+
+def advise(conn, catalog):
+    suggestions = {}
+
+    for query in catalog:
+        name, sql = query.name, query.sql
+        plan = query_plan(conn, query)
+        aliases = table_aliases(sql)
+
+        print(f"{name}")
+        for detail in plan:
+            print(f"    {detail}")
+
+        for alias in full_scans(plan):
+            table = aliases.get(alias, alias)
+            index = suggest_index(sql, alias)
+            if index:
+                suggestions.setdefault((table, index), []).append(name)
+                print(f"    -> full scan of {table}, suggested index {table}({', '.join(index)})")
+            else:
+                print(f"    -> full scan of {table}, no join or filter columns to index")
+
+    return suggestions
+
+
+def existing_indexes(conn, table):
+    indexes = set()
+    for row in conn.execute(f"PRAGMA index_list({table})"):
+        columns = tuple(info[2] for info in conn.execute(f"PRAGMA index_info({row[1]})"))
+        indexes.add(columns)
+    return indexes
+
+
+def create_indexes(conn, suggestions):
+    created = []
+
+    for table, index in suggestions:
+        if any(columns[:len(index)] == index for columns in existing_indexes(conn, table)):
+            continue
+
+        sql_request = index_sql(table, index, prefix="auto")
+        try:
+            conn.execute(sql_request)
+            created.append(sql_request)
+        except sqlite3.Error as e:
+            print(e)
+
+    conn.commit()
+    conn.execute("ANALYZE")
+    return created
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report full scans in query/*.sql and create missing indexes")
+    parser.add_argument("--database", default=database)
+    parser.add_argument("--apply", action="store_true", help="create the suggested indexes")
+    args = parser.parse_args()
+
+    conn = get_connection(args.database)
+    aggregates.install(conn)
+    suggestions = advise(conn, QueryCatalog())
+
+    print("\nSuggested indexes:")
+    for (table, index), names in suggestions.items():
+        print(f"    {table}({', '.join(index)}) used by {', '.join(names)}")
+
+    if args.apply:
+        for sql_request in create_indexes(conn, suggestions):
+            print(sql_request)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        pool.close_all()
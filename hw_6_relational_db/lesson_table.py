@@ -10,6 +10,8 @@ class Lesson:
 
 
 class LessonTable(Table):
+    row_type = Lesson
+
     def __init__(self):
         super().__init__("lesson",
         {
@@ -19,16 +21,13 @@ class LessonTable(Table):
         },
         [
             "FOREIGN KEY(teacher_id_fn) REFERENCES teacher(id)"
+        ],
+        [
+            ("teacher_id_fn",)
         ])
 
     def create(self, lesson: Lesson) -> int | None:
         return super().create(lesson.__dict__)
 
     def get_all(self) -> list[Lesson] | None:
-        result = []
-        rows = super.get_all()
-
-        for i in rows:
-            result.append(Lesson(*i))
-
-        return result
\ No newline at end of file
+        return list(self.iter_all())
\ No newline at end of file
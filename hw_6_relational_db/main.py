@@ -1,6 +1,9 @@
 import sqlite3
 import faker
 import random
+import aggregates
+from connection import get_connection, pool
+from query_catalog import QueryCatalog
 from table import Table
 from student_table import StudentTable, Student
 from groupe_table import GroupeTable, Groupe
@@ -10,16 +13,17 @@ from lesson_table import LessonTable, Lesson
 
 
 database = "test.sqlite"
+catalog = QueryCatalog()
 
 
 def number_of_elements(table_name):
-    conn = sqlite3.connect(database)
+    conn = get_connection(database)
     cursor = conn.cursor()
 
     cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
     count = cursor.fetchone()[0]
 
-    conn.close()
+    cursor.close()
     return count
 
 
@@ -72,44 +76,29 @@ def generate_fake_lesson(table, amount, start_id):
         )
 
 
-def generate_fake_score(table, max_amount, start_id):
+def generate_fake_score(table, max_amount, start_id, batch_size=10000):
     fake_data = faker.Faker()
 
     num_stud = number_of_elements('student')
     num_less = number_of_elements('lesson')
 
-    id = 1
+    def scores():
+        id = start_id
 
-    for i in range(1, num_less + 1):
-        for j in range(1, num_stud + 1):
-            amount = random.randint(1, max_amount)
-            for k in range(0, amount):
-                table.create(
-                    Score(
+        for i in range(1, num_less + 1):
+            for j in range(1, num_stud + 1):
+                amount = random.randint(1, max_amount)
+                for k in range(0, amount):
+                    yield Score(
                         id, random.randint(0, 12), fake_data.date_time(), j, i
                     )
-                )
-                id += 1
-
-
-def select_projects(conn, sql):
-    rows = None
-    cur = conn.cursor()
-
-    try:
-        cur.execute(sql)
-        rows = cur.fetchall()
-    except Error as e:
-        print(e)
-    finally:
-        cur.close()
-
-    return rows
+                    id += 1
 
+    return table.create_many(scores(), batch_size)
 
 
 def main():
-    with sqlite3.connect(database) as conn:
+    with get_connection(database) as conn:
         if conn is not None:
 
             Table.conn = conn
@@ -120,24 +109,29 @@ def main():
             lesson_table = LessonTable()
             score_table = ScoreTable()
 
+            aggregates.install(conn)
+
             # generate_fake_teachers(teacher_table, 2, 1)
             # generate_fake_lesson(lesson_table, 4, 1)
             # generate_fake_groupes(groupe_table, 2, 1)
             # generate_fake_students(student_table, 10, 1)
             # generate_fake_score(score_table, 2, 1)
 
-            sql_list = ['query_1.sql', 'query_2.sql', 'query_3.sql', 'query_4.sql', 'query_5.sql', 'query_6.sql', 'query_7.sql', 'query_8.sql', 'query_9.sql', 'query_10.sql', 'query_11.sql', 'query_12.sql']
+            total = 0
+
+            for i, query in enumerate(catalog):
+                result, elapsed = catalog.timed(conn, query.name)
+                total += elapsed
+                print(f"SQL request {i + 1} ({elapsed * 1000:.2f} ms)\n{result}\n")
 
-            for i in range(len(sql_list)):
-                with open(f"query/{sql_list[i]}", 'r') as f:
-                    sql_script = f.read()
-                
-                result = select_projects(conn, sql_script)
-                print(f"SQL request {i + 1}\n{result}\n")
+            print(f"Total query time: {total * 1000:.2f} ms")
             
         else:
             print("Error! cannot create the database connection.")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        main()
+    finally:
+        pool.close_all()
\ No newline at end of file
@@ -1,6 +1,5 @@
-select st.id, st.name, avg(sc.score) as avg_score 
-from student as st 
-left join score as sc on sc.student_id_fn = st.id 
-group by st.id, st.name 
-order by avg_score desc
+select st.id, st.name, ss.total * 1.0 / ss.cnt as avg_score
+from score_student_summary as ss
+inner join student as st on st.id = ss.student_id_fn
+order by ss.total * 1.0 / ss.cnt desc
 limit 5
\ No newline at end of file
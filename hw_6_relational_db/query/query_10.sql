@@ -3,4 +3,4 @@ from teacher t
 inner join lesson l on l.teacher_id_fn = t.id
 inner join score sc on l.id = sc.lesson_id_fn
 inner join student s on s.id = sc.student_id_fn
-where s.name = 'Elizabeth Glover' and t.name = 'Jasmine Reese'
\ No newline at end of file
+where s.name = :student and t.name = :teacher
\ No newline at end of file
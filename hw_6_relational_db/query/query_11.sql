@@ -3,4 +3,4 @@ from teacher t
 right join lesson l on t.id = l.teacher_id_fn
 join score sc on l.id = sc.lesson_id_fn
 left join student s on s.id = sc.student_id_fn
-where s.name = 'Troy Cooley' and t.name = 'Robert Bentley'
\ No newline at end of file
+where s.name = :student and t.name = :teacher
\ No newline at end of file
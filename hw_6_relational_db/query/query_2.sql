@@ -1,8 +1,8 @@
-select st.id, st.name, avg(sc.score) as avg_grade
-from student as st
-right join score as sc on sc.student_id_fn = st.id
-left join lesson as l on sc.lesson_id_fn = l.id
-where l.lesson = 'Animator'
+select st.id, st.name, sum(ssl.total) * 1.0 / sum(ssl.cnt) as avg_grade
+from lesson as l
+inner join score_student_lesson_summary as ssl on ssl.lesson_id_fn = l.id
+left join student as st on st.id = ssl.student_id_fn
+where l.lesson = :lesson
 group by st.id, st.name
 order by avg_grade desc
 limit 1
\ No newline at end of file
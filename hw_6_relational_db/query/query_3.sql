@@ -1,7 +1,6 @@
-select g.id, g.name, avg(s.score) as avg_score
-from groupe g
-inner join student st on g.id = st.groupe_id_fn
-right join score s on st.id = s.student_id_fn
-inner join lesson l on l.id = s.lesson_id_fn
-where l.lesson = 'Designer, graphic'
-group by g.id, g.name
+select g.id, g.name, sum(sgl.total) * 1.0 / sum(sgl.cnt) as avg_score
+from lesson l
+inner join score_groupe_lesson_summary sgl on sgl.lesson_id_fn = l.id
+inner join groupe g on g.id = sgl.groupe_id_fn
+where l.lesson = :lesson
+group by g.id, g.name
\ No newline at end of file
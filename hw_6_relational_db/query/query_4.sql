@@ -1,2 +1,2 @@
-select avg(s.score) as avg_score
-from score s
\ No newline at end of file
+select sum(ss.total) * 1.0 / sum(ss.cnt) as avg_score
+from score_student_summary ss
\ No newline at end of file
@@ -1,4 +1,4 @@
 select s.id, s.name, g.name
 from student s
 left join groupe g on s.groupe_id_fn = g.id
-where g.id = 2
\ No newline at end of file
+where g.id = :groupe_id
\ No newline at end of file
@@ -3,4 +3,4 @@ from groupe g
 inner join student st on st.groupe_id_fn = g.id
 right join score s on s.student_id_fn = st.id
 left join lesson l on l.id = s.lesson_id_fn
-where l.lesson = 'Producer, radio' and g.name = 'Walker-Lopez'
\ No newline at end of file
+where l.lesson = :lesson and g.name = :groupe
\ No newline at end of file
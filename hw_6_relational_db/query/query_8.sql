@@ -1,5 +1,4 @@
-select t.name, avg(s.score) as avg_score
+select t.name, sum(ts.total) * 1.0 / sum(ts.cnt) as avg_score
 from teacher t
-right join lesson l on t.id = l.teacher_id_fn
-left join score s on s.lesson_id_fn = l.id
-where t.name = 'Jason Bradley'
\ No newline at end of file
+left join score_teacher_summary ts on ts.teacher_id_fn = t.id
+where t.name = :teacher
\ No newline at end of file
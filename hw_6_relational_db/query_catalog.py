@@ -0,0 +1,78 @@
+import os
+import re
+import sqlite3
+import time
+import typing
+from dataclasses import dataclass
+
+
+QUERY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "query")
+PARAMETER = re.compile(r"(?<!:):(\w+)")
+
+DEFAULT_PARAMS = {
+    "query_2": {"lesson": "Animator"},
+    "query_3": {"lesson": "Designer, graphic"},
+    "query_5": {"teacher": "Jasmine Reese"},
+    "query_6": {"groupe_id": 2},
+    "query_7": {"lesson": "Producer, radio", "groupe": "Walker-Lopez"},
+    "query_8": {"teacher": "Jason Bradley"},
+    "query_9": {"student_id": 1},
+    "query_10": {"student": "Elizabeth Glover", "teacher": "Jasmine Reese"},
+    "query_11": {"student": "Troy Cooley", "teacher": "Robert Bentley"},
+    "query_12": {"groupe": "Chen, Sutton and Huang", "lesson": "Air broker"},
+}
+
+
+@dataclass
+class Query:
+    name: str
+    sql: str
+    params: tuple[str, ...]
+
+
+class QueryCatalog:
+    def __init__(self, query_dir: str = QUERY_DIR) -> None:
+        self.queries: dict[str, Query] = {}
+
+        files = [name for name in os.listdir(query_dir) if name.endswith(".sql")]
+        for file_name in sorted(files, key=lambda name: int(re.sub(r"\D", "", name) or 0)):
+            with open(os.path.join(query_dir, file_name), "r") as f:
+                sql = f.read().strip()
+
+            name = file_name.removesuffix(".sql")
+            self.queries[name] = Query(name, sql, tuple(dict.fromkeys(PARAMETER.findall(sql))))
+
+    def __iter__(self) -> typing.Iterator[Query]:
+        return iter(self.queries.values())
+
+    def __getitem__(self, name: str) -> Query:
+        return self.queries[name]
+
+    def bind(self, name: str, params: dict[str, typing.Any] | None = None) -> dict[str, typing.Any]:
+        query = self.queries[name]
+        values = {**DEFAULT_PARAMS.get(name, {}), **(params or {})}
+
+        missing = [param for param in query.params if param not in values]
+        if missing:
+            raise ValueError(f"{name}: missing parameters {', '.join(missing)}")
+
+        return {param: values[param] for param in query.params}
+
+    def execute(self, conn: sqlite3.Connection, name: str, **params: typing.Any) -> list[tuple] | None:
+        rows = None
+        cur = conn.cursor()
+
+        try:
+            cur.execute(self.queries[name].sql, self.bind(name, params))
+            rows = cur.fetchall()
+        except sqlite3.Error as e:
+            print(e)
+        finally:
+            cur.close()
+
+        return rows
+
+    def timed(self, conn: sqlite3.Connection, name: str, **params: typing.Any) -> tuple[list[tuple] | None, float]:
+        start = time.perf_counter()
+        rows = self.execute(conn, name, **params)
+        return rows, time.perf_counter() - start
@@ -0,0 +1,111 @@
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+import aggregates
+from connection import connect_readonly, get_connection, pool
+from query_catalog import QueryCatalog
+
+
+database = "test.sqlite"
+
+
+class ReadOnlyPool:
+    def __init__(self, database: str) -> None:
+        self.database = database
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.connections: list[sqlite3.Connection] = []
+
+    def get(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+
+        if conn is None:
+            conn = connect_readonly(self.database)
+            self.local.conn = conn
+            with self.lock:
+                self.connections.append(conn)
+
+        return conn
+
+    def close_all(self) -> None:
+        with self.lock:
+            for conn in self.connections:
+                conn.close()
+            self.connections.clear()
+
+
+def run_query(readers: ReadOnlyPool, catalog: QueryCatalog, name: str) -> dict[str, typing.Any]:
+    rows, elapsed = catalog.timed(readers.get(), name)
+    return {"name": name, "elapsed_ms": round(elapsed * 1000, 3), "rows": rows}
+
+
+def run_report(database: str, catalog: QueryCatalog, workers: int = 4) -> dict[str, typing.Any]:
+    readers = ReadOnlyPool(database)
+    start = time.perf_counter()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda query: run_query(readers, catalog, query.name), catalog))
+    finally:
+        readers.close_all()
+
+    return {
+        "wall_ms": round((time.perf_counter() - start) * 1000, 3),
+        "query_ms": round(sum(result["elapsed_ms"] for result in results), 3),
+        "queries": results,
+    }
+
+
+def write_json(report: dict[str, typing.Any], output: typing.TextIO) -> None:
+    json.dump(report, output, ensure_ascii=False, indent=2, default=str)
+    output.write("\n")
+
+
+def write_csv(report: dict[str, typing.Any], output: typing.TextIO) -> None:
+    writer = csv.writer(output)
+    writer.writerow(["query", "elapsed_ms", "row"])
+
+    for result in report["queries"]:
+        for row in result["rows"] or [()]:
+            writer.writerow([result["name"], result["elapsed_ms"], *row])
+
+    writer.writerow(["total", report["query_ms"]])
+    writer.writerow(["wall", report["wall_ms"]])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the report queries in parallel on read-only connections")
+    parser.add_argument("--database", default=database)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument("--output", help="file to write, defaults to stdout")
+    args = parser.parse_args()
+
+    # The summary tables must exist before the read-only connections open
+    aggregates.install(get_connection(args.database))
+    pool.close_all()
+
+    report = run_report(args.database, QueryCatalog(), args.workers)
+    write = write_json if args.format == "json" else write_csv
+
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            write(report, f)
+    else:
+        write(report, sys.stdout)
+
+    print(f"{len(report['queries'])} queries: {report['query_ms']:.2f} ms of query time in {report['wall_ms']:.2f} ms wall time", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        pool.close_all()
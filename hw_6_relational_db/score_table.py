@@ -13,6 +13,8 @@ class Score:
 
 
 class ScoreTable(Table):
+    row_type = Score
+
     def __init__(self):
         super().__init__("score",
         {
@@ -25,16 +27,14 @@ class ScoreTable(Table):
         [
             "FOREIGN KEY(student_id_fn) REFERENCES student(id)",
             "FOREIGN KEY(lesson_id_fn) REFERENCES lesson(id)"
+        ],
+        [
+            ("student_id_fn", "lesson_id_fn", "score", "date"),
+            ("lesson_id_fn", "student_id_fn", "score")
         ])
 
     def create(self, score: Score) -> int | None:
         return super().create(score.__dict__)
 
     def get_all(self) -> list[Score] | None:
-        result = []
-        rows = super.get_all()
-
-        for i in rows:
-            result.append(Score(*i))
-
-        return result
\ No newline at end of file
+        return list(self.iter_all())
\ No newline at end of file
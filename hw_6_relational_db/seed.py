@@ -0,0 +1,172 @@
+import argparse
+import time
+import faker
+import numpy as np
+import aggregates
+from connection import get_connection, pool
+from table import Table
+from student_table import StudentTable
+from groupe_table import GroupeTable
+from teacher_table import TeacherTable
+from score_table import ScoreTable
+from lesson_table import LessonTable
+
+
+database = "test.sqlite"
+TABLES = ["score", "student", "lesson", "groupe", "teacher"]
+DATE_START = np.datetime64("2020-01-01T00:00:00")
+DATE_SPAN = 4 * 365 * 24 * 60 * 60
+
+
+def max_id(conn, table_name):
+    return conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table_name}").fetchone()[0]
+
+
+def name_pool(fake_data, size):
+    first_names = [fake_data.first_name() for _ in range(size)]
+    last_names = [fake_data.last_name() for _ in range(size)]
+    return np.array(first_names), np.array(last_names)
+
+
+def existing_names(conn, table_name):
+    return {row[0] for row in conn.execute(f"SELECT name FROM {table_name}")}
+
+
+def unique_names(rng, first_names, last_names, amount, taken=()):
+    names = np.char.add(np.char.add(rng.choice(first_names, amount), " "), rng.choice(last_names, amount))
+
+    # taken holds the names already in the table, so reruns without --reset stay unique too
+    taken = set(taken)
+    counts = {}
+    result = []
+    for name in names.tolist():
+        count = counts.get(name, 1)
+        unique = name if count == 1 else f"{name} {count}"
+        while unique in taken:
+            count += 1
+            unique = f"{name} {count}"
+
+        counts[name] = count
+        taken.add(unique)
+        result.append(unique)
+
+    return result
+
+
+def insert_all(table, rows, amount, batch_size=50000):
+    count = table.insert_rows(rows, batch_size)
+    if count != amount:
+        raise RuntimeError(f"Inserted {count} of {amount} {table.table_name} rows, scores were not seeded")
+    return count
+
+
+def score_rows(rng, amount, start_id, student_ids, lesson_ids, chunk_size):
+    for offset in range(0, amount, chunk_size):
+        size = min(chunk_size, amount - offset)
+
+        ids = np.arange(start_id + offset, start_id + offset + size)
+        scores = rng.integers(0, 13, size)
+        seconds = rng.integers(0, DATE_SPAN, size).astype("timedelta64[s]")
+        dates = np.char.replace(np.datetime_as_string(DATE_START + seconds, unit="s"), "T", " ")
+        students = rng.integers(student_ids[0], student_ids[1] + 1, size)
+        lessons = rng.integers(lesson_ids[0], lesson_ids[1] + 1, size)
+
+        yield from zip(ids.tolist(), scores.tolist(), dates.tolist(), students.tolist(), lessons.tolist())
+
+
+def seed_database(conn, scale, seed=1, teachers=5, lessons=8, groupes=3, students=None, batch_size=50000, reset=False):
+    if students is None:
+        students = max(10, scale // 200)
+
+    if reset:
+        for table_name in [*TABLES, *aggregates.SUMMARY_TABLES]:
+            conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+        conn.commit()
+
+    Table.conn = conn
+    teacher_table = TeacherTable()
+    groupe_table = GroupeTable()
+    lesson_table = LessonTable()
+    student_table = StudentTable()
+    score_table = ScoreTable()
+
+    rng = np.random.default_rng(seed)
+    fake_data = faker.Faker()
+    fake_data.seed_instance(seed)
+    first_names, last_names = name_pool(fake_data, 500)
+
+    teacher_start = max_id(conn, "teacher") + 1
+    insert_all(teacher_table, zip(
+        range(teacher_start, teacher_start + teachers),
+        unique_names(rng, first_names, last_names, teachers, existing_names(conn, "teacher")),
+    ), teachers)
+
+    groupe_start = max_id(conn, "groupe") + 1
+    insert_all(groupe_table, (
+        (i, fake_data.company()) for i in range(groupe_start, groupe_start + groupes)
+    ), groupes)
+
+    lesson_start = max_id(conn, "lesson") + 1
+    insert_all(lesson_table, zip(
+        range(lesson_start, lesson_start + lessons),
+        (fake_data.job() for _ in range(lessons)),
+        rng.integers(teacher_start, teacher_start + teachers, lessons).tolist(),
+    ), lessons)
+
+    student_start = max_id(conn, "student") + 1
+    insert_all(student_table, zip(
+        range(student_start, student_start + students),
+        unique_names(rng, first_names, last_names, students, existing_names(conn, "student")),
+        rng.integers(groupe_start, groupe_start + groupes, students).tolist(),
+    ), students, batch_size)
+
+    score_start = max_id(conn, "score") + 1
+    with aggregates.suspended(conn):
+        return score_table.insert_rows(score_rows(
+            rng,
+            scale,
+            score_start,
+            (student_start, student_start + students - 1),
+            (lesson_start, lesson_start + lessons - 1),
+            batch_size,
+        ), batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the database with generated groupes, teachers, lessons, students and scores")
+    parser.add_argument("--database", default=database)
+    parser.add_argument("--scale", type=int, default=1_000_000, help="number of score rows")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--teachers", type=int, default=5)
+    parser.add_argument("--lessons", type=int, default=8)
+    parser.add_argument("--groupes", type=int, default=3)
+    parser.add_argument("--students", type=int, default=None, help="defaults to scale / 200")
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument("--reset", action="store_true", help="drop existing tables first")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        count = seed_database(
+            get_connection(args.database),
+            args.scale,
+            args.seed,
+            args.teachers,
+            args.lessons,
+            args.groupes,
+            args.students,
+            args.batch_size,
+            args.reset,
+        )
+    except RuntimeError as e:
+        parser.exit(1, f"{e}\n")
+    elapsed = time.perf_counter() - start
+
+    print(f"Inserted {count} scores in {elapsed:.2f}s ({count / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        pool.close_all()
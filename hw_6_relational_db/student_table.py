@@ -10,6 +10,8 @@ class Student:
 
 
 class StudentTable(Table):
+    row_type = Student
+
     def __init__(self):
         super().__init__("student",
         {
@@ -19,19 +21,16 @@ class StudentTable(Table):
         },
         [
             "FOREIGN KEY(groupe_id_fn) REFERENCES groupe(id)"
+        ],
+        [
+            ("groupe_id_fn",)
         ])
 
     def create(self, student: Student) -> int | None:
         return super().create(student.__dict__)
 
     def get_all(self) -> list[Student] | None:
-        result = []
-        rows = super.get_all()
-
-        for i in rows:
-            result.append(Student(*i))
-
-        return result
+        return list(self.iter_all())
 
     def update():
         pass
@@ -1,30 +1,40 @@
 import sqlite3
 import logging
 import typing
+from itertools import islice
 
 column_name = str
 column_type = str
+index_columns = tuple[column_name, ...]
 
 class Table:
     conn: sqlite3.Connection = None
+    row_type: type | None = None
 
-    def __init__(self, table_name: str, columns: dict[column_name, column_type], constrains: list[str]) -> None:
+    def __init__(self, table_name: str, columns: dict[column_name, column_type], constrains: list[str], indexes: list[index_columns] | None = None) -> None:
         self.table_name = table_name
         self.columns = columns
         self.constrains = constrains
+        self.indexes = indexes or []
+
+        table_columns = (",").join(columns.keys())
+        table_questions = (",").join("?" for _ in columns.keys())
+        self.insert_sql = f"INSERT INTO {table_name}({table_columns}) VALUES({table_questions})"
+        self.select_sql = f"SELECT {table_columns} FROM {table_name}"
 
         full_columns = [f"{key} {val}" for key, val in columns.items()]
         full_columns.extend(constrains)
 
         temp = (", ").join(full_columns)
 
-        sql_request = f"CREATE TABLE IF NOT EXISTS {table_name} ({temp});"
-
-        logging.debug(sql_request)
+        sql_requests = [f"CREATE TABLE IF NOT EXISTS {table_name} ({temp});"]
+        sql_requests.extend(index_sql(table_name, index) for index in self.indexes)
 
         try:
             c = self.conn.cursor()
-            c.execute(sql_request)
+            for sql_request in sql_requests:
+                logging.debug(sql_request)
+                c.execute(sql_request)
             self.conn.commit()
         except sqlite3.Error as e:
             print(e)
@@ -32,23 +42,41 @@ class Table:
             c.close()
 
     def create(self, obj: dict) -> int | None:
-        table_columns = (",").join(self.columns.keys())
-        table_questions = (",").join("?" for _ in self.columns.keys())
-
-        sql_request = f"INSERT INTO {self.table_name}({table_columns}) VALUES({table_questions})"
-        
-        logging.debug(sql_request)
+        logging.debug(self.insert_sql)
 
         c = self.conn.cursor()
 
         try:
-            c.execute(sql_request, list(obj.values()))
+            c.execute(self.insert_sql, list(obj.values()))
             self.conn.commit()
         except sqlite3.Error as e:
             print(e)
         finally:
             c.close()
 
+    def create_many(self, objs: typing.Iterable[typing.Any], batch_size: int = 10000) -> int:
+        return self.insert_rows((tuple(obj.__dict__.values()) for obj in objs), batch_size)
+
+    def insert_rows(self, rows: typing.Iterable[typing.Sequence[typing.Any]], batch_size: int = 10000) -> int:
+        logging.debug(self.insert_sql)
+
+        count = 0
+        rows = iter(rows)
+        c = self.conn.cursor()
+
+        try:
+            with self.conn:
+                while batch := list(islice(rows, batch_size)):
+                    c.executemany(self.insert_sql, batch)
+                    count += len(batch)
+        except sqlite3.Error as e:
+            print(e)
+            count = 0
+        finally:
+            c.close()
+
+        return count
+
     def get_all(self) -> list[typing.Iterable[typing.Any]] | None:
         rows = None
         cur = self.conn.cursor()
@@ -65,3 +93,25 @@ class Table:
         
         return rows
 
+    def iter_all(self, batch_size: int = 1000) -> typing.Iterator[typing.Any]:
+        cur = self.conn.cursor()
+
+        if self.row_type is not None:
+            row_type = self.row_type
+            cur.row_factory = lambda _, row: row_type(*row)
+
+        logging.debug(self.select_sql)
+
+        try:
+            cur.execute(self.select_sql)
+            while rows := cur.fetchmany(batch_size):
+                yield from rows
+        except sqlite3.Error as e:
+            print(e)
+        finally:
+            cur.close()
+
+
+def index_sql(table_name: str, index: index_columns, prefix: str = "idx") -> str:
+    index_name = "_".join((prefix, table_name, *index))
+    return f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name}({', '.join(index)});"
@@ -9,6 +9,8 @@ class Teacher:
 
 
 class TeacherTable(Table):
+    row_type = Teacher
+
     def __init__(self):
         super().__init__("teacher",
         {
@@ -21,10 +23,4 @@ class TeacherTable(Table):
         return super().create(teacher.__dict__)
 
     def get_all(self) -> list[Teacher] | None:
-        result = []
-        rows = super.get_all()
-
-        for i in rows:
-            result.append(Teacher(*i))
-
-        return result
\ No newline at end of file
+        return list(self.iter_all())
\ No newline at end of file
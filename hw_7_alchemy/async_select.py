@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+import time
+
+import my_select
+from db import make_async_engine, make_async_session, POOL_SIZE
+
+
+SELECTS = [getattr(my_select, f'select_{i}') for i in range(1, 11)]
+
+
+async def timed(Session, select):
+    # Every select gets its own session and so its own pooled connection
+    async with Session() as session:
+        start = time.perf_counter()
+        result = await session.run_sync(select)
+        return result, time.perf_counter() - start
+
+
+async def run_report(async_engine, sequential=False):
+    Session = make_async_session(async_engine)
+    start = time.perf_counter()
+
+    if sequential:
+        results = [await timed(Session, select) for select in SELECTS]
+    else:
+        results = await asyncio.gather(*(timed(Session, select) for select in SELECTS))
+
+    return results, time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run the ten report selects concurrently on an async engine")
+    parser.add_argument("--pool-size", type=int, default=max(POOL_SIZE, len(SELECTS)))
+    parser.add_argument("--sequential", action="store_true", help="await the selects one by one for comparison")
+    args = parser.parse_args()
+
+    async_engine = make_async_engine(pool_size=args.pool_size)
+
+    try:
+        results, wall = await run_report(async_engine, args.sequential)
+    finally:
+        await async_engine.dispose()
+
+    for i, (result, elapsed) in enumerate(results, start=1):
+        print(f"SELECT {i} ({elapsed * 1000:.2f} ms)\n{result}\n")
+
+    total = sum(elapsed for _, elapsed in results)
+    slowest = max(elapsed for _, elapsed in results)
+    print(f"Query time {total * 1000:.2f} ms, slowest {slowest * 1000:.2f} ms, wall {wall * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
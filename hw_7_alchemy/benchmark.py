@@ -0,0 +1,103 @@
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from alembic import command
+from alembic.config import Config
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+INIT_REVISION = '0d96db929f48'
+
+
+def alembic_config(partition_scores):
+    config = Config(os.path.join(HERE, 'alembic.ini'))
+    config.set_main_option('script_location', os.path.join(HERE, 'migrations'))
+    # Same as alembic -x partition_scores=..., which the partitioning revision requires on PostgreSQL
+    config.cmd_opts = argparse.Namespace(x=[f'partition_scores={int(partition_scores)}'])
+    return config
+
+
+def analyze(engine):
+    from sqlalchemy import text
+
+    with engine.begin() as connection:
+        connection.execute(text('ANALYZE'))
+
+
+def time_selects(repeat):
+    import my_select
+
+    timings = {}
+
+    for i in range(1, 11):
+        select = getattr(my_select, f'select_{i}')
+        runs = []
+
+        for _ in range(repeat):
+            with my_select.DBSession() as session:
+                start = time.perf_counter()
+                select(session)
+                runs.append((time.perf_counter() - start) * 1000)
+
+        timings[f'select_{i}'] = statistics.median(runs)
+
+    return timings
+
+
+def run(args):
+    # db.py builds the engine from DATABASE_URL at import time
+    os.environ['DATABASE_URL'] = args.url
+
+    from db import engine, PARTITION_SCORES
+    from seed import bulk_seed
+
+    config = alembic_config(PARTITION_SCORES)
+    command.downgrade(config, 'base')
+    command.upgrade(config, INIT_REVISION)
+
+    # Seeded at the init revision, so scores is not partitioned yet whatever DB_PARTITION_SCORES says
+    bulk_seed(args.students, args.groupes, args.lessons, args.teachers, args.scores,
+              batch_size=args.batch_size, check_partitioning=False)
+    analyze(engine)
+    before = time_selects(args.repeat)
+
+    start = time.perf_counter()
+    command.upgrade(config, 'head')
+    analyze(engine)
+    print(f'Migrated to head in {time.perf_counter() - start:.2f}s')
+    after = time_selects(args.repeat)
+
+    engine.dispose()
+
+    print(f'\n{"query":<10} {"before ms":>10} {"after ms":>10} {"speedup":>8}')
+    for name in before:
+        print(f'{name:<10} {before[name]:>10.2f} {after[name]:>10.2f} {before[name] / after[name]:>7.1f}x')
+    print(f'{"total":<10} {sum(before.values()):>10.2f} {sum(after.values()):>10.2f} {sum(before.values()) / sum(after.values()):>7.1f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the my_select queries before and after the index migration")
+    parser.add_argument('--url', help="database to benchmark; it is downgraded to base and reseeded. Defaults to a temporary SQLite file")
+    parser.add_argument('--students', type=int, default=10000)
+    parser.add_argument('--groupes', type=int, default=3)
+    parser.add_argument('--lessons', type=int, default=8)
+    parser.add_argument('--teachers', type=int, default=5)
+    parser.add_argument('--scores', type=int, default=50, help="scores per student")
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.url:
+        run(args)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        args.url = f'sqlite:///{os.path.join(tmp, "benchmark.sqlite")}'
+        run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+import os
+
+from sqlalchemy import create_engine, make_url, URL
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+STATEMENT_TIMEOUT = int(os.getenv('DB_STATEMENT_TIMEOUT', 30000))
+QUERY_CACHE_SIZE = int(os.getenv('DB_QUERY_CACHE_SIZE', 1200))
+
+
+def database_url():
+    # DATABASE_URL=sqlite:///bench.sqlite runs the scripts against a local stand-in
+    url = os.getenv('DATABASE_URL')
+    if url:
+        return url
+
+    return URL.create(
+        'postgresql',
+        username=os.getenv('DB_USER'),
+        password=os.getenv('DB_PASSWORD'),
+        host=os.getenv('DB_HOST'),
+        port=os.getenv('DB_PORT'),
+        database=os.getenv('DB_NAME'),
+    )
+
+
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+
+def in_memory(url):
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and (url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory')
+
+
+def pool_options(url, **kwargs):
+    options = dict(
+        pool_recycle=POOL_RECYCLE,
+        pool_pre_ping=True,
+        query_cache_size=QUERY_CACHE_SIZE,
+    )
+
+    # In-memory SQLite gets a single-connection pool that takes no sizing arguments
+    if not in_memory(url):
+        options.update(
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT,
+        )
+
+    options.update(kwargs)
+    return options
+
+
+def make_engine(url=None, **kwargs):
+    url = url or database_url()
+    connect_args = {}
+
+    if str(url).startswith('postgresql'):
+        connect_args['options'] = f'-c statement_timeout={STATEMENT_TIMEOUT}'
+    elif str(url).startswith('sqlite'):
+        connect_args['timeout'] = STATEMENT_TIMEOUT / 1000
+
+    return create_engine(url, **pool_options(url, connect_args=connect_args, **kwargs))
+
+
+def make_async_engine(url=None, **kwargs):
+    url = make_url(url or database_url())
+    backend = url.get_backend_name()
+    url = url.set(drivername=ASYNC_DRIVERS.get(backend, url.drivername))
+    connect_args = {}
+
+    if backend == 'postgresql':
+        connect_args['server_settings'] = {'statement_timeout': str(STATEMENT_TIMEOUT)}
+    elif backend == 'sqlite':
+        connect_args['timeout'] = STATEMENT_TIMEOUT / 1000
+        if not in_memory(url):
+            # aiosqlite files get a NullPool before SQLAlchemy 2.1, which takes no sizing arguments
+            kwargs.setdefault('poolclass', AsyncAdaptedQueuePool)
+
+    return create_async_engine(url, **pool_options(url, connect_args=connect_args, **kwargs))
+
+
+def make_async_session(async_engine):
+    return async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+
+engine = make_engine()
+
+# DB_PARTITION_SCORES=1 declares scores range-partitioned by month, PostgreSQL only
+PARTITION_SCORES = os.getenv('DB_PARTITION_SCORES') == '1' and engine.dialect.name == 'postgresql'
+
+DBSession = sessionmaker(bind=engine)
+Base = declarative_base()
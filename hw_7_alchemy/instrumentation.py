@@ -0,0 +1,135 @@
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+
+
+@dataclass
+class StatementStats:
+    statement: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    shapes: set = field(default_factory=set)
+    plan: list | None = None
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class CountingCursor:
+    # Wraps the DBAPI cursor so rows are counted as the result fetches them
+    def __init__(self, cursor, stats):
+        self.cursor = cursor
+        self.stats = stats
+
+    def fetchone(self):
+        row = self.cursor.fetchone()
+        if row is not None:
+            self.stats.rows += 1
+        return row
+
+    def fetchmany(self, *args):
+        rows = self.cursor.fetchmany(*args)
+        self.stats.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self.cursor.fetchall()
+        self.stats.rows += len(rows)
+        return rows
+
+    def __iter__(self):
+        for row in self.cursor:
+            self.stats.rows += 1
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+def parameter_shape(parameters, executemany=False):
+    if executemany:
+        return f'{len(parameters)} x {parameter_shape(parameters[0]) if parameters else "()"}'
+
+    if isinstance(parameters, dict):
+        return '{' + ', '.join(f'{key}: {type(value).__name__}' for key, value in parameters.items()) + '}'
+
+    return '(' + ', '.join(type(value).__name__ for value in parameters or ()) + ')'
+
+
+class Instrumentation:
+    def __init__(self, engine, slow_ms=None):
+        self.engine = engine
+        self.slow_ms = slow_ms
+        self.stats = {}
+
+    def attach(self):
+        event.listen(self.engine, 'before_cursor_execute', self.before_cursor_execute)
+        event.listen(self.engine, 'after_cursor_execute', self.after_cursor_execute)
+        return self
+
+    def detach(self):
+        event.remove(self.engine, 'before_cursor_execute', self.before_cursor_execute)
+        event.remove(self.engine, 'after_cursor_execute', self.after_cursor_execute)
+
+    def __enter__(self):
+        return self.attach()
+
+    def __exit__(self, *exc_info):
+        self.detach()
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = (time.perf_counter() - conn.info['query_start'].pop()) * 1000
+
+        stats = self.stats.get(statement)
+        if stats is None:
+            stats = self.stats[statement] = StatementStats(statement)
+
+        stats.calls += 1
+        stats.total_ms += elapsed
+        stats.max_ms = max(stats.max_ms, elapsed)
+        stats.shapes.add(parameter_shape(parameters, executemany))
+
+        if cursor.description is None:
+            stats.rows += max(cursor.rowcount, 0)
+        elif context is not None and context.cursor is cursor:
+            context.cursor = CountingCursor(cursor, stats)
+
+        if self.slow_ms is not None and elapsed >= self.slow_ms and stats.plan is None and not executemany:
+            stats.plan = self.explain(conn, statement, parameters)
+
+    def explain(self, conn, statement, parameters):
+        if not statement.lstrip().upper().startswith('SELECT'):
+            return None
+
+        prefix = 'EXPLAIN ANALYZE' if conn.dialect.name == 'postgresql' else 'EXPLAIN QUERY PLAN'
+        cursor = conn.connection.cursor()
+
+        try:
+            cursor.execute(f'{prefix} {statement}', parameters)
+            return [' '.join(str(value) for value in row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def report(self):
+        lines = [f'{"calls":>5} {"total ms":>10} {"mean ms":>9} {"max ms":>9} {"rows":>7}  statement']
+        stats = sorted(self.stats.values(), key=lambda stats: stats.total_ms, reverse=True)
+
+        for item in stats:
+            statement = ' '.join(item.statement.split())
+            lines.append(f'{item.calls:>5} {item.total_ms:>10.2f} {item.mean_ms:>9.2f} {item.max_ms:>9.2f} {item.rows:>7}  {statement[:100]}')
+            lines.append(f'{"":>46}params {", ".join(sorted(item.shapes))}')
+            for plan_line in item.plan or []:
+                lines.append(f'{"":>46}| {plan_line}')
+
+        total = sum(item.total_ms for item in stats)
+        calls = sum(item.calls for item in stats)
+        lines.append(f'{calls} statements, {len(stats)} distinct, {total:.2f} ms')
+
+        return '\n'.join(lines)
@@ -0,0 +1,135 @@
+"""Partition scores by month
+
+Revision ID: a613c8979f5c
+Revises: c49f11f9f6de
+Create Date: 2026-10-19 16:02:11.418306
+
+On PostgreSQL the choice has to be passed explicitly and must match the
+DB_PARTITION_SCORES setting the models are built with:
+
+    DB_PARTITION_SCORES=1 alembic -x partition_scores=1 upgrade head
+    alembic -x partition_scores=0 upgrade head
+
+To enable partitioning after applying this revision with 0, step back and
+upgrade again:
+
+    alembic downgrade c49f11f9f6de
+    DB_PARTITION_SCORES=1 alembic -x partition_scores=1 upgrade head
+
+Other dialects (the SQLite stand-in) have no partitioning, and this
+revision does nothing there.
+"""
+import datetime
+from typing import Sequence, Union
+
+from alembic import context, op
+from alembic.util import CommandError
+import sqlalchemy as sa
+
+from db import PARTITION_SCORES
+from partitions import month_start, create_partitions, create_default_partition, create_future_partitions, is_partitioned
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a613c8979f5c'
+down_revision: Union[str, None] = 'c49f11f9f6de'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Older rows than this land in the default partition instead of one table per month
+HISTORY_MONTHS = 60
+
+SCORE_INDEXES = {
+    'ix_scores_lesson_id_student_id': ['lesson_id', 'student_id', 'score'],
+    'ix_scores_student_id_lesson_id': ['student_id', 'lesson_id', 'score'],
+}
+
+
+def score_columns():
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('scores_id_seq')"), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('lesson_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['lesson_id'], ['lessons.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ondelete='CASCADE'),
+    ]
+
+
+def swap_scores_table(old_name, *table_args, **table_kwargs):
+    for name in SCORE_INDEXES:
+        op.drop_index(name, table_name='scores')
+
+    op.rename_table('scores', old_name)
+    op.execute(f'ALTER TABLE {old_name} RENAME CONSTRAINT scores_pkey TO {old_name}_pkey')
+    op.execute('ALTER SEQUENCE scores_id_seq OWNED BY NONE')
+
+    op.create_table('scores', *score_columns(), *table_args, **table_kwargs)
+    op.execute('ALTER SEQUENCE scores_id_seq OWNED BY scores.id')
+
+
+def copy_scores(old_name):
+    op.execute(
+        f'INSERT INTO scores (id, score, date, student_id, lesson_id) '
+        f'SELECT id, score, date, student_id, lesson_id FROM {old_name}'
+    )
+    op.drop_table(old_name)
+
+    for name, columns in SCORE_INDEXES.items():
+        op.create_index(name, 'scores', columns, unique=False)
+
+
+def partition_requested():
+    value = context.get_x_argument(as_dictionary=True).get('partition_scores')
+    if value not in ('0', '1'):
+        raise CommandError(
+            'Pass -x partition_scores=1 to partition scores by month or -x partition_scores=0 to keep '
+            'it a plain table; see the docstring of revision a613c8979f5c'
+        )
+
+    requested = value == '1'
+    if requested != PARTITION_SCORES:
+        raise CommandError(
+            f'-x partition_scores={value} does not match DB_PARTITION_SCORES, '
+            f'set both so the models agree with the schema'
+        )
+
+    return requested
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    if not partition_requested():
+        print('scores left unpartitioned, see revision a613c8979f5c to enable partitioning later')
+        return
+
+    if is_partitioned(bind):
+        return
+
+    swap_scores_table(
+        'scores_unpartitioned',
+        sa.PrimaryKeyConstraint('id', 'date'),
+        postgresql_partition_by='RANGE (date)',
+    )
+
+    first, last = bind.execute(sa.text('SELECT MIN(date), MAX(date) FROM scores_unpartitioned')).first()
+    if first is not None:
+        history = month_start(last) - datetime.timedelta(days=HISTORY_MONTHS * 31)
+        create_partitions(bind, max(first, history), last)
+    create_future_partitions(bind)
+    create_default_partition(bind)
+
+    copy_scores('scores_unpartitioned')
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or not is_partitioned(bind):
+        return
+
+    swap_scores_table('scores_partitioned', sa.PrimaryKeyConstraint('id'))
+    copy_scores('scores_partitioned')
@@ -1,111 +1,200 @@
-from config import engine
+import argparse
+
+from db import DBSession, engine
+from instrumentation import Instrumentation
 from seed import Student, Score, Lesson, Groupe, Teacher
 
-from sqlalchemy import func, desc, and_
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-engine = create_engine(f'postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}')
-
-DBSession = sessionmaker(bind=engine)
-
-
-def select_1(session):
-    return session.query(Student.name, func.avg(Score.score).label('avg_score')) \
-        .select_from(Score) \
-        .join(Student) \
-        .group_by(Student.id) \
-        .order_by(desc('avg_score')) \
-        .limit(5) \
-        .all()
-
-
-def select_2(session):
-    return session.query(Student.name, func.avg(Score.score).label('avg_score')) \
-        .select_from(Score) \
-        .join(Student) \
-        .join(Lesson) \
-        .where(Lesson.id == 1) \
-        .group_by(Student.id) \
-        .order_by(desc('avg_score')) \
-        .first()
-        
-
-def select_3(session):
-    return session.query(Groupe.name, func.avg(Score.score).label('avg_score')) \
-        .select_from(Groupe) \
-        .join(Student) \
-        .join(Score) \
-        .join(Lesson) \
-        .where(Lesson.id == 1) \
-        .group_by(Groupe.name) \
-        .all()
-        
-
-def select_4(session):
-    return session.query(func.avg(Score.score).label('avg_score')).one()
-
-
-def select_5(session):
-    return session.query(Lesson.lesson) \
-        .join(Teacher) \
-        .where(Teacher.id == 2) \
-        .all()
-
-
-def select_6(session):
-    return session.query(Student.name) \
-        .join(Groupe) \
-        .where(Groupe.id == 3) \
-        .all()
-
-
-def select_7(session):
-    return session.query(Groupe.name, Student.name, Lesson.lesson, Score.score) \
-        .select_from(Groupe) \
-        .join(Student) \
-        .join(Score) \
-        .join(Lesson) \
-        .where(and_(Lesson.id == 8), (Groupe.id == 1)) \
-        .all()
-
-
-def select_8(session):
-    return session.query(Teacher.name, func.avg(Score.score).label('avg_score')) \
-        .select_from(Teacher) \
-        .join(Lesson) \
-        .join(Score) \
-        .where(Teacher.id == 4) \
-        .group_by(Teacher.id) \
-        .all()
-
-def select_9(session):
-    return session.query(Lesson.lesson) \
-        .select_from(Student) \
-        .join(Score) \
-        .join(Lesson) \
-        .where(Student.id == 1) \
-        .distinct() \
-        .all()
-
-
-def select_10(session):
-    return session.query(Lesson.lesson) \
-        .select_from(Teacher) \
-        .join(Lesson) \
-        .join(Score) \
-        .join(Student) \
-        .where(and_(Student.id == 1), (Teacher.id == 1)) \
-        .distinct() \
-        .all()
+from sqlalchemy import select, lambda_stmt, bindparam, func, desc
+
+
+def in_period(stmt, start=None, end=None):
+    # Bound date limits let PostgreSQL prune score partitions outside the period
+    if start is not None:
+        stmt += lambda s: s.where(Score.date >= start)
+    if end is not None:
+        stmt += lambda s: s.where(Score.date < end)
+    return stmt
+
+
+def select_1(session, start=None, end=None):
+    stmt = lambda_stmt(lambda: select(Student.name, func.avg(Score.score).label('avg_score'))
+        .select_from(Score)
+        .join(Student)
+        .group_by(Student.id)
+        .order_by(desc('avg_score'))
+        .limit(5))
+    return session.execute(in_period(stmt, start, end)).all()
+
+
+def select_2(session, lesson_id=1):
+    stmt = lambda_stmt(lambda: select(Student.name, func.avg(Score.score).label('avg_score'))
+        .select_from(Score)
+        .join(Student)
+        .join(Lesson)
+        .where(Lesson.id == lesson_id)
+        .group_by(Student.id)
+        .order_by(desc('avg_score'))
+        .limit(1))
+    return session.execute(stmt).first()
+
+
+def select_3(session, lesson_id=1):
+    stmt = lambda_stmt(lambda: select(Groupe.name, func.avg(Score.score).label('avg_score'))
+        .select_from(Groupe)
+        .join(Student)
+        .join(Score)
+        .join(Lesson)
+        .where(Lesson.id == lesson_id)
+        .group_by(Groupe.name))
+    return session.execute(stmt).all()
+
+
+def select_4(session, start=None, end=None):
+    stmt = lambda_stmt(lambda: select(func.avg(Score.score).label('avg_score')))
+    return session.execute(in_period(stmt, start, end)).one()
+
+
+def select_5(session, teacher_id=2):
+    stmt = lambda_stmt(lambda: select(Lesson.lesson)
+        .join(Teacher)
+        .where(Teacher.id == teacher_id))
+    return session.execute(stmt).all()
+
+
+def select_6(session, groupe_id=3):
+    stmt = lambda_stmt(lambda: select(Student.name)
+        .join(Groupe)
+        .where(Groupe.id == groupe_id))
+    return session.execute(stmt).all()
+
+
+def select_7(session, lesson_id=8, groupe_id=1):
+    stmt = lambda_stmt(lambda: select(Groupe.name, Student.name, Lesson.lesson, Score.score)
+        .select_from(Groupe)
+        .join(Student)
+        .join(Score)
+        .join(Lesson)
+        .where(Lesson.id == lesson_id, Groupe.id == groupe_id))
+    return session.execute(stmt).all()
+
+
+def select_8(session, teacher_id=4):
+    stmt = lambda_stmt(lambda: select(Teacher.name, func.avg(Score.score).label('avg_score'))
+        .select_from(Teacher)
+        .join(Lesson)
+        .join(Score)
+        .where(Teacher.id == teacher_id)
+        .group_by(Teacher.id))
+    return session.execute(stmt).all()
+
+def select_9(session, student_id=1):
+    stmt = lambda_stmt(lambda: select(Lesson.lesson)
+        .select_from(Student)
+        .join(Score)
+        .join(Lesson)
+        .where(Student.id == student_id)
+        .distinct())
+    return session.execute(stmt).all()
+
+
+def select_10(session, student_id=1, teacher_id=1):
+    stmt = lambda_stmt(lambda: select(Lesson.lesson)
+        .select_from(Teacher)
+        .join(Lesson)
+        .join(Score)
+        .join(Student)
+        .where(Student.id == student_id, Teacher.id == teacher_id)
+        .distinct())
+    return session.execute(stmt).all()
+
+
+def select_latest(session, student_id=1, start=None, end=None, limit=10):
+    stmt = lambda_stmt(lambda: select(Score.date, Lesson.lesson, Score.score)
+        .join(Lesson)
+        .where(Score.student_id == student_id)
+        .order_by(desc(Score.date))
+        .limit(limit))
+    return session.execute(in_period(stmt, start, end)).all()
+
+
+# Batched variants take a list of ids and run as one statement with an
+# expanding IN list; the first selected column is the id the row belongs to.
+ids = bindparam('ids', expanding=True)
+
+student_averages_stmt = select(Score.student_id, Student.name, func.avg(Score.score).label('avg_score')) \
+    .join(Student) \
+    .where(Score.student_id.in_(ids)) \
+    .group_by(Score.student_id, Student.name)
+
+groupe_averages_stmt = select(Score.lesson_id, Groupe.name, func.avg(Score.score).label('avg_score')) \
+    .select_from(Groupe) \
+    .join(Student) \
+    .join(Score) \
+    .where(Score.lesson_id.in_(ids)) \
+    .group_by(Score.lesson_id, Groupe.name)
+
+teacher_lessons_stmt = select(Lesson.teacher_id, Lesson.lesson) \
+    .where(Lesson.teacher_id.in_(ids))
+
+groupe_students_stmt = select(Student.groupe_id, Student.name) \
+    .where(Student.groupe_id.in_(ids))
+
+teacher_averages_stmt = select(Lesson.teacher_id, func.avg(Score.score).label('avg_score')) \
+    .select_from(Lesson) \
+    .join(Score) \
+    .where(Lesson.teacher_id.in_(ids)) \
+    .group_by(Lesson.teacher_id)
+
+student_lessons_stmt = select(Score.student_id, Lesson.lesson) \
+    .join(Lesson) \
+    .where(Score.student_id.in_(ids)) \
+    .distinct()
+
+
+def select_many(session, stmt, keys):
+    keys = list(dict.fromkeys(keys))
+    result = {key: [] for key in keys}
+
+    for row in session.execute(stmt, {'ids': keys}):
+        result[row[0]].append(tuple(row[1:]))
+
+    return result
+
+
+def student_averages(session, student_ids):
+    return select_many(session, student_averages_stmt, student_ids)
+
+
+def groupe_averages(session, lesson_ids):
+    return select_many(session, groupe_averages_stmt, lesson_ids)
+
+
+def teacher_lessons(session, teacher_ids):
+    return select_many(session, teacher_lessons_stmt, teacher_ids)
+
+
+def groupe_students(session, groupe_ids):
+    return select_many(session, groupe_students_stmt, groupe_ids)
+
+
+def teacher_averages(session, teacher_ids):
+    return select_many(session, teacher_averages_stmt, teacher_ids)
+
+
+def student_lessons(session, student_ids):
+    return select_many(session, student_lessons_stmt, student_ids)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the report selects")
+    parser.add_argument("--profile", action="store_true", help="print per-statement latency, rows and parameter shapes")
+    parser.add_argument("--slow-ms", type=float, help="capture EXPLAIN ANALYZE for statements slower than this")
+    args = parser.parse_args()
+
+    instrumentation = Instrumentation(engine, args.slow_ms)
+    if args.profile or args.slow_ms is not None:
+        instrumentation.attach()
+
     with DBSession() as session:
         result_1 = select_1(session)
         result_2 = select_2(session)
@@ -117,6 +206,8 @@ if __name__ == "__main__":
         result_8 = select_8(session)
         result_9 = select_9(session)
         result_10 = select_10(session)
+        averages = student_averages(session, range(1, 6))
+        latest = select_latest(session, limit=5)
 
     print(f"SELECT 1\n{result_1}\n")
     print(f"SELECT 2\n{result_2}\n")
@@ -127,4 +218,9 @@ if __name__ == "__main__":
     print(f"SELECT 7\n{result_7}\n")
     print(f"SELECT 8\n{result_8}\n")
     print(f"SELECT 9\n{result_9}\n")
-    print(f"SELECT 10\n{result_10}\n")
\ No newline at end of file
+    print(f"SELECT 10\n{result_10}\n")
+    print(f"Averages for students 1-5\n{averages}\n")
+    print(f"Latest scores of student 1\n{latest}\n")
+
+    if instrumentation.stats:
+        print(instrumentation.report())
@@ -0,0 +1,71 @@
+import argparse
+import datetime
+import re
+
+from sqlalchemy import text
+
+
+def month_start(value):
+    return datetime.datetime(value.year, value.month, 1)
+
+
+def next_month(value):
+    return datetime.datetime(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f'{table}_y{month.year}m{month.month:02d}'
+
+
+def is_partition_name(name, table='scores'):
+    return re.fullmatch(rf'{table}_(y\d{{4}}m\d{{2}}|default)', name) is not None
+
+
+def create_partitions(connection, start, end, table='scores'):
+    """Creates the monthly partitions of table covering start..end, works with op.get_bind() too"""
+    names = []
+    month = month_start(start)
+
+    while month <= end:
+        name = partition_name(table, month)
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{next_month(month):%Y-%m-%d}')"
+        ))
+        names.append(name)
+        month = next_month(month)
+
+    return names
+
+
+def create_default_partition(connection, table='scores'):
+    connection.execute(text(f'CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT'))
+
+
+def create_future_partitions(connection, months=3, table='scores'):
+    start = month_start(datetime.datetime.now())
+    end = start
+    for _ in range(months):
+        end = next_month(end)
+
+    return create_partitions(connection, start, end, table)
+
+
+def is_partitioned(connection, table='scores'):
+    return connection.execute(
+        text('SELECT 1 FROM pg_partitioned_table WHERE partrelid = CAST(:table AS regclass)'),
+        {'table': table},
+    ).first() is not None
+
+
+if __name__ == '__main__':
+    # Partitioning itself is switched on by migration a613c8979f5c, see its docstring
+    parser = argparse.ArgumentParser(description="Create upcoming monthly partitions of scores, run it ahead of time from cron")
+    parser.add_argument('--months', type=int, default=3)
+    args = parser.parse_args()
+
+    from db import engine
+
+    with engine.begin() as connection:
+        for name in create_future_partitions(connection, args.months):
+            print(name)
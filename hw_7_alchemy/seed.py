@@ -2,20 +2,17 @@ import faker
 import datetime
 import sqlalchemy
 import random
+import argparse
+import csv
+import io
+import itertools
+import time
 
-from sqlalchemy import create_engine, String, Float, DateTime, ForeignKey
-from sqlalchemy.orm import sessionmaker, Mapped, mapped_column
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import insert, Index, String, Float, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
 
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-engine = create_engine(f'postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}')
-
-DBSession = sessionmaker(bind=engine)
-Base = declarative_base()
+from db import engine, DBSession, Base, PARTITION_SCORES
+from partitions import create_partitions, create_default_partition, create_future_partitions, is_partitioned
 
 
 class Student(Base):
@@ -25,6 +22,10 @@ class Student(Base):
     name: Mapped[str] = mapped_column(String, nullable=False)
     groupe_id: Mapped[int] = mapped_column(ForeignKey('groupes.id', ondelete="CASCADE"))
 
+    __table_args__ = (
+        Index('ix_students_groupe_id', 'groupe_id', 'name'),
+    )
+
 
 class Groupe(Base):
     __tablename__ = 'groupes'
@@ -47,28 +48,58 @@ class Lesson(Base):
     lesson: Mapped[str] = mapped_column(String, nullable=False)
     teacher_id : Mapped[int] = mapped_column(ForeignKey('teachers.id', ondelete="CASCADE"))
 
+    __table_args__ = (
+        Index('ix_lessons_teacher_id', 'teacher_id', 'lesson'),
+    )
+
 
 class Score(Base):
     __tablename__ = 'scores'
 
-    id: Mapped[int] = mapped_column(primary_key=True)
+    # A partitioned table's primary key has to include the partition key
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     score: Mapped[float] = mapped_column(Float, nullable=False)
-    date: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
+    date: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, primary_key=PARTITION_SCORES)
     student_id: Mapped[int] = mapped_column(ForeignKey('students.id', ondelete="CASCADE"))
     lesson_id: Mapped[int] = mapped_column(ForeignKey('lessons.id', ondelete="CASCADE"))
 
+    # Covering indexes for the per-student and per-lesson averages in my_select
+    __table_args__ = (
+        Index('ix_scores_student_id_lesson_id', 'student_id', 'lesson_id', 'score'),
+        Index('ix_scores_lesson_id_student_id', 'lesson_id', 'student_id', 'score'),
+        {'postgresql_partition_by': 'RANGE (date)'} if PARTITION_SCORES else {},
+    )
 
-def init_db():
-    Base.metadata.bind = engine
+
+DATE_START = datetime.datetime(2020, 1, 1)
+DATE_SPAN = 4 * 365 * 24 * 60 * 60
+
+
+def create_tables(check_partitioning=True):
     Base.metadata.create_all(engine)
 
-    fake_data = faker.Faker()
+    if engine.dialect.name != 'postgresql':
+        return
+
+    with engine.begin() as connection:
+        # The Score primary key follows DB_PARTITION_SCORES, so it has to agree with the real table
+        if check_partitioning and is_partitioned(connection) != PARTITION_SCORES:
+            raise RuntimeError(
+                'DB_PARTITION_SCORES does not match the scores table, '
+                'see migration a613c8979f5c to switch partitioning on or off'
+            )
+
+        if PARTITION_SCORES and is_partitioned(connection):
+            create_partitions(connection, DATE_START, DATE_START + datetime.timedelta(seconds=DATE_SPAN))
+            create_future_partitions(connection)
+            create_default_partition(connection)
+
 
-    student_amount = 50
-    groupe_amount = 3
-    lesson_amount = 8
-    teacher_amount = 5
-    score_amount = 20
+def init_db(student_amount=50, groupe_amount=3, lesson_amount=8, teacher_amount=5, score_amount=20):
+    Base.metadata.bind = engine
+    create_tables()
+
+    fake_data = faker.Faker()
 
     with DBSession() as session:
 
@@ -127,5 +158,105 @@ def init_db():
         session.commit()
 
 
+def batched(rows, batch_size):
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, batch_size)):
+        yield batch
+
+
+def score_rows(student_ids, lesson_ids, score_amount):
+    for student_id in student_ids:
+        for _ in range(score_amount):
+            yield (
+                round(random.uniform(1.0, 12.0), 2),
+                DATE_START + datetime.timedelta(seconds=random.randrange(DATE_SPAN)),
+                student_id,
+                random.choice(lesson_ids),
+            )
+
+
+def insert_returning_ids(connection, model, rows):
+    result = connection.execute(insert(model).returning(model.id, sort_by_parameter_order=True), rows)
+    return result.scalars().all()
+
+
+def insert_scores(connection, rows, batch_size):
+    count = 0
+    columns = ("score", "date", "student_id", "lesson_id")
+
+    for batch in batched(rows, batch_size):
+        connection.execute(insert(Score), [dict(zip(columns, row)) for row in batch])
+        count += len(batch)
+
+    return count
+
+
+def copy_scores(connection, rows, batch_size):
+    count = 0
+    cursor = connection.connection.cursor()
+
+    try:
+        for batch in batched(rows, batch_size):
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(batch)
+            buffer.seek(0)
+
+            cursor.copy_expert("COPY scores (score, date, student_id, lesson_id) FROM STDIN WITH (FORMAT csv)", buffer)
+            count += len(batch)
+    finally:
+        cursor.close()
+
+    return count
+
+
+def bulk_seed(student_amount=50, groupe_amount=3, lesson_amount=8, teacher_amount=5, score_amount=20, method="insert", batch_size=10000, check_partitioning=True):
+    create_tables(check_partitioning)
+
+    if method == "copy" and engine.dialect.name != "postgresql":
+        raise ValueError(f"COPY needs PostgreSQL, not {engine.dialect.name}")
+
+    fake_data = faker.Faker()
+
+    with engine.begin() as connection:
+        groupe_ids = insert_returning_ids(connection, Groupe, [
+            {"name": fake_data.unique.company()} for _ in range(groupe_amount)
+        ])
+        teacher_ids = insert_returning_ids(connection, Teacher, [
+            {"name": fake_data.unique.name()} for _ in range(teacher_amount)
+        ])
+        lesson_ids = insert_returning_ids(connection, Lesson, [
+            {"lesson": fake_data.unique.catch_phrase(), "teacher_id": teacher_ids[num % teacher_amount]}
+            for num in range(lesson_amount)
+        ])
+
+        names = [fake_data.name() for _ in range(min(student_amount, 1000))]
+        student_ids = []
+        for batch in batched(range(student_amount), batch_size):
+            student_ids += insert_returning_ids(connection, Student, [
+                {"name": names[num % len(names)], "groupe_id": groupe_ids[num % groupe_amount]} for num in batch
+            ])
+
+        start = time.perf_counter()
+        load = copy_scores if method == "copy" else insert_scores
+        count = load(connection, score_rows(student_ids, lesson_ids, score_amount), batch_size)
+        elapsed = time.perf_counter() - start
+
+    print(f"Inserted {count} scores with {method} in {elapsed:.2f}s ({count / elapsed:,.0f} rows/s)")
+    return count
+
+
 if __name__ == "__main__":
-    init_db()
+    parser = argparse.ArgumentParser(description="Seed the database with groupes, teachers, lessons, students and scores")
+    parser.add_argument("--students", type=int, default=50)
+    parser.add_argument("--groupes", type=int, default=3)
+    parser.add_argument("--lessons", type=int, default=8)
+    parser.add_argument("--teachers", type=int, default=5)
+    parser.add_argument("--scores", type=int, default=20, help="scores per student")
+    parser.add_argument("--bulk", choices=["insert", "copy"], help="load with Core executemany batches or PostgreSQL COPY instead of the ORM")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    if args.bulk:
+        bulk_seed(args.students, args.groupes, args.lessons, args.teachers, args.scores, args.bulk, args.batch_size)
+    else:
+        init_db(args.students, args.groupes, args.lessons, args.teachers, args.scores)
@@ -0,0 +1,54 @@
+import json
+import functools
+from collections import namedtuple
+
+
+CachedQuote = namedtuple('CachedQuote', ['id', 'text'])
+
+
+class QuoteCache:
+    def __init__(self, client, ttl=600, prefix='quotes'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.index = f'{prefix}:keys'
+
+    def key(self, name, args):
+        return f'{self.prefix}:{name}:{json.dumps(args, separators=(",", ":"))}'
+
+    def get(self, key):
+        raw = self.client.get(key)
+        if raw is None:
+            return None
+
+        return [CachedQuote(*item) for item in json.loads(raw)]
+
+    def set(self, key, quotes):
+        data = json.dumps([[str(quote.id), quote.text] for quote in quotes], separators=(',', ':'))
+
+        with self.client.pipeline() as pipe:
+            pipe.set(key, data, ex=self.ttl)
+            pipe.sadd(self.index, key)
+            pipe.expire(self.index, self.ttl)
+            pipe.execute()
+
+        return [CachedQuote(str(quote.id), quote.text) for quote in quotes]
+
+    def invalidate(self):
+        keys = self.client.smembers(self.index)
+        self.client.delete(self.index, *keys)
+        return len(keys)
+
+    def __call__(self, func):
+        # Caches the materialised id/text list, never the lazy QuerySet
+        @functools.wraps(func)
+        def wrapper(*args):
+            key = self.key(func.__name__, args)
+
+            quotes = self.get(key)
+            if quotes is None:
+                quotes = self.set(key, list(func(*args) or []))
+
+            return quotes
+
+        return wrapper
@@ -1,13 +1,13 @@
 import json
 import redis
-from redis_lru import RedisLRU
 from mongoengine import connect
 from models import Author, Quote
+from cache import QuoteCache
 
 connect(db='AuthorsAndQuotes', host='127.0.0.1', port=27017)
 
 client = redis.StrictRedis(host="localhost", port=6379, password=None)
-cache = RedisLRU(client)
+cache = QuoteCache(client)
 
 
 def load_authors_from_json():
@@ -24,6 +24,8 @@ def load_authors_from_json():
         author = Author(**author_data)
         author.save()
 
+    cache.invalidate()
+
 
 def load_quotes_from_json():
     with open('../json/quotes.json', 'r') as file:
@@ -41,31 +43,33 @@ def load_quotes_from_json():
         quote = Quote(**quote_data)
         quote.save()
 
+    cache.invalidate()
+
 @cache
 def search_quotes_by_author(name, task):
     if task == 'main':
         author = Author.objects(fullname=name).first()
-        quote = Quote.objects(author=author)
+        quote = Quote.objects(author=author).only('text')
         return quote
     
     elif task == 'additional':
         authors = Author.objects(fullname__istartswith=f'{name}')
-        quotes = Quote.objects(author__in=authors)
+        quotes = Quote.objects(author__in=authors).only('text')
         return quotes
     
 @cache
 def search_quotes_by_tag(tag, task):
     if task == 'main':
-        quotes = Quote.objects(tags=tag)
+        quotes = Quote.objects(tags=tag).only('text')
         return quotes
     
     elif task == 'additional':
-        quotes = Quote.objects(tags__istartswith=f'{tag}')
+        quotes = Quote.objects(tags__istartswith=f'{tag}').only('text')
         return quotes
     
 @cache
 def search_quotes_by_tags(tags):
-    quotes = Quote.objects(tags__name__in=tags)
+    quotes = Quote.objects(tags__in=tags).only('text')
     return quotes
 
 
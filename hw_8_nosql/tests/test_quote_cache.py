@@ -0,0 +1,86 @@
+import os
+import sys
+import json
+import unittest
+from unittest.mock import patch
+
+import fakeredis
+import mongomock
+from mongoengine import connect, disconnect
+
+FIRST_TASK = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'first_task')
+sys.path.insert(0, FIRST_TASK)
+
+import db
+from models import Author, Quote
+
+
+class TestQuoteCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        disconnect()
+        connect('test', mongo_client_class=mongomock.MongoClient)
+
+    @classmethod
+    def tearDownClass(cls):
+        disconnect()
+
+    def setUp(self):
+        Author.drop_collection()
+        Quote.drop_collection()
+        db.cache.client = fakeredis.FakeRedis()
+
+        self.author = Author(fullname='Albert Einstein', born_date='March 14, 1879', born_location='Ulm, Germany', description='Physicist')
+        self.author.save()
+        self.quote = Quote(text='A quote', author=self.author, tags=['life', 'world'])
+        self.quote.save()
+        Quote(text='Another quote', author=self.author, tags=['humor']).save()
+
+    def test_search_materialises_quotes(self):
+        result = db.search_quotes_by_tag('life', 'main')
+
+        self.assertEqual(result, [(str(self.quote.id), 'A quote')])
+        self.assertEqual(result[0].text, 'A quote')
+
+    def test_cached_hit_skips_mongo(self):
+        first = db.search_quotes_by_author('Albert Einstein', 'main')
+
+        with patch.object(db, 'Quote') as quote, patch.object(db, 'Author') as author:
+            second = db.search_quotes_by_author('Albert Einstein', 'main')
+
+        quote.objects.assert_not_called()
+        author.objects.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual(len(second), 2)
+
+    def test_cached_value_is_compact_list_with_ttl(self):
+        db.search_quotes_by_tags(['life', 'humor'])
+
+        key = db.cache.key('search_quotes_by_tags', (['life', 'humor'],))
+        raw = db.cache.client.get(key)
+
+        self.assertEqual(sorted(json.loads(raw)), sorted([[str(quote.id), quote.text] for quote in Quote.objects]))
+        self.assertGreater(db.cache.client.ttl(key), 0)
+        self.assertLessEqual(db.cache.client.ttl(key), db.cache.ttl)
+
+    def test_loading_invalidates_cache(self):
+        self.assertEqual(db.search_quotes_by_tag('world', 'additional'), [(str(self.quote.id), 'A quote')])
+
+        cwd = os.getcwd()
+        os.chdir(FIRST_TASK)
+        try:
+            db.load_authors_from_json()
+            self.assertEqual(db.cache.client.scard(db.cache.index), 0)
+
+            db.load_quotes_from_json()
+        finally:
+            os.chdir(cwd)
+
+        result = db.search_quotes_by_tag('world', 'additional')
+
+        self.assertGreater(len(result), 1)
+        self.assertEqual(db.cache.client.scard(db.cache.index), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()